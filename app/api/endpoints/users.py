@@ -1,3 +1,4 @@
+import base64
 import requests
 import pandas as pd
 from fastapi import APIRouter, Depends, status, HTTPException, Query
@@ -9,10 +10,12 @@ from app.models import User
 from app.schemas.requests import UserUpdatePasswordRequest,CandlestickRequest
 from app.schemas.responses import UserResponse
 import numpy as np
-from app.candlestick import candlestick
-import re
+from app.candlestick import bitmask, candlestick, registry
+from app.candlestick.occurrences import OccurrenceIndex
+from app.candlestick.patterns.candle_array import CandleArray
 from app.neurotrader.TechnicalAnalysisAutomation.head_shoulders import extract_hs_pattern_info,find_hs_patterns
 router = APIRouter()
+occurrence_index = OccurrenceIndex(max_bytes=64 * 1024 * 1024)
 
 
 @router.get("/me", response_model=UserResponse, description="Get current user")
@@ -50,11 +53,6 @@ async def reset_current_user_password(
     await session.commit()
 
 
-def pascal_to_snake(name):
-    # Convert from PascalCase to snake_case
-    return re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower()
-
-
 @router.post("/test-candlestick")
 async def test_trading_pattern(request: CandlestickRequest):
     try:
@@ -80,20 +78,41 @@ async def test_trading_pattern(request: CandlestickRequest):
         candles_df['T'] = pd.to_datetime(candles_df['T'], unit='ms')
 
         if pattern_type == 'candlestickPatterns':
-            func = pascal_to_snake(target)
-            if hasattr(candlestick, func):
-                print(func)
-                pattern_function = getattr(candlestick, func)
-                print(pattern_function)
-                pattern_df = pattern_function(candles_df)
-            
+            if registry.is_registered(target):
+                ohlc = ['open', 'high', 'low', 'close']
+
+                if request.last is None and request.since is None:
+                    # Closed candles are indexed once, polls only check the
+                    # ones closed since. The forming candle is checked alone.
+                    closed_df = candles_df.iloc[:-1]
+                    occurrence_index.extend(symbol, interval, closed_df, [target], ohlc, time_column='T')
+                    times = occurrence_index.last(symbol, interval, target, 20)
+
+                    pattern = registry.get_pattern(target)
+                    if pattern.has_pattern(candles_df, ohlc, False, output='array', last=1, time_column='T')[-1]:
+                        times = np.append(times, CandleArray.to_epoch_ms(candles_df['T'].iloc[-1:]))[-20:]
+
+                    return [{'T': time, target: True} for time in pd.to_datetime(times, unit='ms')]
+                else:
+                    pattern = registry.get_pattern(target)
+                    since = pd.Timestamp(request.since, unit='ms') if request.since is not None else None
+                    pattern_df = pattern.has_pattern(candles_df, ohlc, False,
+                                                     last=request.last, since=since, time_column='T')
+
                 detected_patterns = pattern_df[pattern_df[target] == True][['T', target]]
-                print(detected_patterns)
                 last_20_patterns = detected_patterns.tail(20)
 
                 return last_20_patterns.to_dict(orient='records')
             else:
                 return {"error": f"No candlestick pattern detection function found for {target}"}
+        elif pattern_type == 'candlestickMask':
+            # Every pattern on every candle, four bytes per candle with one
+            # bit per pattern in the order given
+            masks = candlestick.scan_all(candles_df, output='mask')
+
+            return {"patterns": registry.pattern_names(),
+                    "times": CandleArray.to_epoch_ms(candles_df['T']).tolist(),
+                    "masks": base64.b64encode(bitmask.to_bytes(masks)).decode()}
         elif pattern_type == 'chart':
             candles_df = candles_df.set_index('T')
             log_data = np.log(candles_df['close'].to_numpy())
@@ -0,0 +1,176 @@
+import argparse
+import datetime
+import inspect
+import json
+import os
+import platform
+import subprocess
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from . import candlestick
+from .patterns.candle_features import CandleFeatures
+
+__histories_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'neurotrader', 'TechnicalAnalysisAutomation')
+default_histories = [os.path.join(__histories_dir, 'BTCUSDT3600.csv'),
+                     os.path.join(__histories_dir, 'BTCUSDT86400.csv')]
+default_synthetic_sizes = [1_000_000]
+
+
+def helpers(names=None):
+    # Every public pattern helper of the candlestick module, scans excluded
+    found = {name: function
+             for name, function in inspect.getmembers(candlestick, inspect.isfunction)
+             if function.__module__ == candlestick.__name__
+             and not name.startswith('_')
+             and not name.startswith('scan_')}
+
+    if names is None:
+        return found
+
+    unknown = set(names) - set(found)
+    if unknown:
+        raise Exception('Unknown candlestick helpers: {0}'.format(', '.join(sorted(unknown))))
+
+    return {name: found[name] for name in names}
+
+
+def synthetic_candles(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, rows)))
+    open = np.concatenate([[100], close[:-1]]) * np.exp(rng.normal(0, 0.002, rows))
+    high = np.maximum(open, close) * np.exp(np.abs(rng.normal(0, 0.004, rows)))
+    low = np.minimum(open, close) * np.exp(-np.abs(rng.normal(0, 0.004, rows)))
+
+    return pd.DataFrame({'open': open, 'high': high, 'low': low, 'close': close})
+
+
+def measure(function, args, repeat=3, setup=None):
+    # Times are taken without tracing, which slows allocations down, and
+    # the peak memory comes from one extra traced run
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+
+    tracemalloc.start()
+    try:
+        function(*args)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'wall_time': min(timings),
+            'mean_wall_time': sum(timings) / len(timings),
+            'peak_memory': peak_memory}
+
+
+def run(datasets, names=None, modes=(False, True), repeat=3, include_scan=True):
+    functions = helpers(names)
+    results = []
+
+    for dataset, candles_df in datasets.items():
+        for is_reversed in modes:
+            cases = [(name, function, (candles_df, ['open', 'high', 'low', 'close'], is_reversed))
+                     for name, function in functions.items()]
+
+            if include_scan:
+                cases.append(('scan_all', candlestick.scan_all,
+                              (candles_df, None, ['open', 'high', 'low', 'close'], is_reversed)))
+
+            for name, function, args in cases:
+                # Every run starts without features cached by the previous one
+                record = measure(function, args, repeat, setup=CandleFeatures.clear_cache)
+                record.update({'dataset': dataset,
+                               'helper': name,
+                               'is_reversed': is_reversed,
+                               'candles': len(candles_df),
+                               'candles_per_second': len(candles_df) / record['wall_time']})
+                results.append(record)
+
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'],
+                                capture_output=True,
+                                text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)),
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {'commit': commit,
+            'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.platform()}
+
+
+def write(results, path):
+    with open(path, 'w') as output:
+        json.dump({'environment': environment(), 'results': results}, output, indent=2)
+
+
+def compare(baseline_path, current_path):
+    # Ratio of current to baseline wall time for every case found in both
+    # runs, above 1 meaning the current commit is slower
+    def load(path):
+        with open(path) as source:
+            return {(result['dataset'], result['helper'], result['is_reversed']): result
+                    for result in json.load(source)['results']}
+
+    baseline, current = load(baseline_path), load(current_path)
+    rows = [{'dataset': key[0],
+             'helper': key[1],
+             'is_reversed': key[2],
+             'baseline_wall_time': baseline[key]['wall_time'],
+             'wall_time': current[key]['wall_time'],
+             'ratio': current[key]['wall_time'] / baseline[key]['wall_time']}
+            for key in current if key in baseline]
+
+    return pd.DataFrame(rows, columns=['dataset', 'helper', 'is_reversed',
+                                       'baseline_wall_time', 'wall_time', 'ratio'])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the candlestick pattern helpers')
+    parser.add_argument('--output', default='candlestick_benchmark.json')
+    parser.add_argument('--histories', nargs='*', default=default_histories)
+    parser.add_argument('--synthetic', nargs='*', type=int, default=default_synthetic_sizes,
+                        help='Sizes of the generated series, in candles')
+    parser.add_argument('--helpers', nargs='*', default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--compare', default=None,
+                        help='Earlier results to compare this run with')
+    args = parser.parse_args(argv)
+
+    datasets = {os.path.basename(path): pd.read_csv(path) for path in args.histories}
+    for rows in args.synthetic:
+        datasets['synthetic_{0}'.format(rows)] = synthetic_candles(rows)
+
+    results = run(datasets, args.helpers, repeat=args.repeat)
+    write(results, args.output)
+
+    summary = pd.DataFrame(results)[['dataset', 'helper', 'is_reversed', 'wall_time', 'candles_per_second']]
+    print(summary.to_string(index=False))
+
+    if args.compare:
+        print(compare(args.compare, args.output).sort_values('ratio', ascending=False).to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+import numpy as np
+import pandas as pd
+
+from . import registry
+
+mask_dtype = np.dtype('<u4')
+
+
+def bit_positions():
+    # Bits follow the registry order, one per registered pattern
+    names = registry.pattern_names()
+    if len(names) > mask_dtype.itemsize * 8:
+        raise Exception('Only {0} patterns fit in a mask'.format(mask_dtype.itemsize * 8))
+
+    return {name: bit for bit, name in enumerate(names)}
+
+
+def pattern_mask(*names):
+    bits = bit_positions()
+    mask = 0
+
+    for name in names:
+        if name not in bits:
+            raise Exception('{0} is not a registered candlestick pattern'.format(name))
+        mask |= 1 << bits[name]
+
+    return mask_dtype.type(mask)
+
+
+def direction_mask(direction):
+    # Every pattern pointing the given way, like bearish or bullish
+    return pattern_mask(*[name for name in registry.pattern_names()
+                          if registry.get_pattern_class(name).direction == direction])
+
+
+def pack(found, patterns=None):
+    # One mask per candle out of a boolean frame or (candles, patterns)
+    # matrix, a pattern column setting the bit of that pattern
+    if isinstance(found, pd.DataFrame):
+        patterns = list(found.columns) if patterns is None else patterns
+        found = found.to_numpy(dtype=bool)
+
+    found = np.asarray(found, dtype=bool)
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    if found.ndim != 2 or found.shape[1] != len(patterns):
+        raise Exception('Provide one column of flags for each pattern')
+
+    bits = bit_positions()
+    weights = np.array([1 << bits[name] for name in patterns], dtype=np.uint64)
+
+    return (found @ weights).astype(mask_dtype) if len(patterns) else np.zeros(len(found), dtype=mask_dtype)
+
+
+def unpack(masks, patterns=None, index=None):
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    bits = bit_positions()
+    masks = np.asarray(masks, dtype=mask_dtype)
+    flags = np.array([bits[name] for name in patterns], dtype=mask_dtype)
+
+    return pd.DataFrame((masks[:, np.newaxis] >> flags) & 1 == 1, index=index, columns=list(patterns))
+
+
+def has_any(masks, mask):
+    return (np.asarray(masks, dtype=mask_dtype) & mask) != 0
+
+
+def has_all(masks, mask):
+    return (np.asarray(masks, dtype=mask_dtype) & mask) == mask
+
+
+def count(masks):
+    # Number of patterns found on each candle
+    masks = np.asarray(masks, dtype=mask_dtype)
+
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(masks)
+
+    masks = masks - ((masks >> 1) & 0x55555555)
+    masks = (masks & 0x33333333) + ((masks >> 2) & 0x33333333)
+    return ((((masks + (masks >> 4)) & 0x0F0F0F0F) * 0x01010101) & 0xFFFFFFFF) >> 24
+
+
+def to_bytes(masks):
+    # Four little endian bytes per candle, whatever the machine
+    return np.ascontiguousarray(masks, dtype=mask_dtype).tobytes()
+
+
+def from_bytes(data):
+    return np.frombuffer(data, dtype=mask_dtype)
+
+
+def save(path, masks, times=None):
+    # The pattern names are kept with the masks, so they still read right
+    # after patterns are registered in another order
+    arrays = {'masks': np.asarray(masks, dtype=mask_dtype),
+              'patterns': np.array(registry.pattern_names())}
+    if times is not None:
+        arrays['times'] = np.asarray(times, dtype=np.int64)
+
+    np.savez(path, **arrays)
+
+
+def load(path):
+    with np.load(path) as saved:
+        masks = saved['masks']
+        patterns = saved['patterns'].tolist()
+        times = saved['times'] if 'times' in saved else None
+
+    if patterns != registry.pattern_names():
+        # Bits of the saved order moved to the current one, patterns no
+        # longer registered are dropped
+        kept = [bit for bit, name in enumerate(patterns) if registry.is_registered(name)]
+        found = (masks[:, np.newaxis] >> np.array(kept, dtype=mask_dtype)) & 1 == 1
+        masks = pack(found, [patterns[bit] for bit in kept])
+
+    return masks, times
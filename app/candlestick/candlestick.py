@@ -1,47 +1,18 @@
-import re
-
-__builders = dict()
-__default_ohlc = ['open', 'high', 'low', 'close']
-
-
-def __get_file_name(class_name):
-    res = re.findall('[A-Z][^A-Z]*', class_name)
-    return '_'.join([cur.lower() for cur in res])
+from concurrent.futures import ProcessPoolExecutor
 
+import numpy as np
+import pandas as pd
 
-def __load_module(module_path):
-    p = module_path.rfind('.') + 1
-    super_module = module_path[p:]
-    try:
-        module = __import__(module_path, fromlist=[super_module], level=0)
-        return module
-    except ImportError as e:
-        raise e
+from . import bitmask, registry
+from .patterns.candle_array import CandleArray
+from .patterns.candle_features import CandleFeatures
+from .patterns.hits import Hits
 
-
-def __get_class_by_name(class_name):
-    file_name = __get_file_name(class_name)
-    print(file_name)
-    mod_name = 'candlestick.patterns.' + file_name
-
-    if mod_name not in __builders:
-        module = __load_module(mod_name)
-        __builders[mod_name] = module
-    else:
-        module = __builders[mod_name]
-    return getattr(module, class_name)
+__default_ohlc = ['open', 'high', 'low', 'close']
 
 
 def __create_object(class_name, target):
-    return __get_class_by_name(class_name)(target=target)
-
-
-def bullish_hanging_man(candles_df,
-                   ohlc=__default_ohlc,
-                   is_reversed=False,
-                   target=None):
-    bullhm = __create_object('BullishHangingMan', target)
-    return bullhm.has_pattern(candles_df, ohlc, is_reversed)
+    return registry.get_pattern(class_name, target)
 
 
 def hanging_man(candles_df,
@@ -108,6 +79,22 @@ def dragonfly_doji(candles_df,
     return doji.has_pattern(candles_df, ohlc, is_reversed)
 
 
+def evening_star(candles_df,
+                 ohlc=__default_ohlc,
+                 is_reversed=False,
+                 target=None):
+    cndl = __create_object('EveningStar', target)
+    return cndl.has_pattern(candles_df, ohlc, is_reversed)
+
+
+def evening_star_doji(candles_df,
+                      ohlc=__default_ohlc,
+                      is_reversed=False,
+                      target=None):
+    cndl = __create_object('EveningStarDoji', target)
+    return cndl.has_pattern(candles_df, ohlc, is_reversed)
+
+
 def bearish_engulfing(candles_df,
                    ohlc=__default_ohlc,
                    is_reversed=False,
@@ -236,3 +223,325 @@ def tweezer_bottoms(candles_df,
                    target=None):
     cndl = __create_object('TweezerBottoms', target)
     return cndl.has_pattern(candles_df, ohlc, is_reversed)
+
+
+def scan_all(candles_df,
+             patterns=None,
+             ohlc=__default_ohlc,
+             is_reversed=False,
+             output='frame',
+             transform=None):
+    if output not in ('frame', 'hits', 'scores', 'mask'):
+        raise Exception('Output must be one of frame, hits, scores or mask')
+
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    if isinstance(candles_df, CandleArray):
+        candles = CandleFeatures.from_array(candles_df)
+        if transform is not None:
+            candles = candles.transform(transform)
+
+        results = __scan_features(candles, candles_df.index, patterns, is_reversed, output)
+        return __scan_output(results, candles_df.time, output)
+
+    if not isinstance(candles_df, pd.DataFrame):
+        raise Exception('Candles must be in Panda data frame type')
+
+    if not ohlc or len(ohlc) != 4:
+        raise Exception('Provide list of four elements indicating columns in strings. '
+                        'Default: [open, high, low, close]')
+
+    if not set(ohlc).issubset(candles_df.columns):
+        raise Exception('Provided columns does not exist in given data frame')
+
+    # Columns are coerced and per-candle quantities (body, range, shadows,
+    # direction) computed once, then shared by every requested pattern
+    candles = CandleFeatures.from_frame(candles_df, *ohlc)
+    if transform is not None:
+        candles = candles.transform(transform)
+
+    results = __scan_features(candles, candles_df.index, patterns, is_reversed, output)
+
+    times = None
+    if output == 'hits' and isinstance(candles_df.index, pd.DatetimeIndex):
+        times = CandleArray.to_epoch_ms(candles_df.index)
+
+    return __scan_output(results, times, output)
+
+
+def __scan_output(results, times, output):
+    if output in ('frame', 'scores', 'mask'):
+        return results
+
+    return {pattern: Hits.from_mask(results[pattern].to_numpy(), times) for pattern in results.columns}
+
+
+def __scan_features(candles, index, patterns, is_reversed, output='frame'):
+    if output == 'mask':
+        # Each pattern sets its own bit, without a column per pattern
+        bits = bitmask.bit_positions()
+        masks = np.zeros(len(candles), dtype=bitmask.mask_dtype)
+
+        for class_name in patterns:
+            finder = registry.get_pattern(class_name)
+
+            if len(candles) >= finder.required_count:
+                masks |= finder.detect(candles, is_reversed).astype(bitmask.mask_dtype) << bits[class_name]
+
+        return pd.Series(masks, index=index, name='mask')
+
+    if output == 'scores':
+        results = np.full((len(candles), len(patterns)), np.nan)
+    else:
+        results = np.zeros((len(candles), len(patterns)), dtype=bool)
+
+    for col_idx, class_name in enumerate(patterns):
+        finder = registry.get_pattern(class_name)
+
+        if len(candles) >= finder.required_count:
+            if output == 'scores':
+                results[:, col_idx] = finder.score(candles, is_reversed)
+            else:
+                results[:, col_idx] = finder.detect(candles, is_reversed)
+
+    return pd.DataFrame(results, index=index, columns=list(patterns))
+
+
+def __panel_array(values):
+    if isinstance(values, pd.Series):
+        return CandleFeatures.to_array(values)
+
+    return np.asarray(values, dtype=np.float64)
+
+
+def __scan_panel_arrays(open, high, low, close, group_sizes, patterns, scores=False):
+    candles = CandleFeatures(open, high, low, close)
+    group_starts = np.cumsum(group_sizes) - group_sizes
+    positions = np.arange(len(candles)) - np.repeat(group_starts, group_sizes)
+
+    if scores:
+        results = np.full((len(candles), len(patterns)), np.nan)
+    else:
+        results = np.zeros((len(candles), len(patterns)), dtype=bool)
+
+    for col_idx, class_name in enumerate(patterns):
+        finder = registry.get_pattern(class_name)
+
+        # Rows whose lookback would reach into the previous symbol are dropped
+        valid = positions >= finder.required_count - 1
+
+        if scores:
+            results[:, col_idx] = np.where(valid, finder.score(candles, False), np.nan)
+        else:
+            results[:, col_idx] = finder.detect(candles, False) & valid
+
+    return results
+
+
+def __scan_panel(columns, group_sizes, patterns, processes, scores=False):
+    if not processes or processes < 2 or len(group_sizes) < 2:
+        return __scan_panel_arrays(*columns, group_sizes, patterns, scores)
+
+    # Whole symbols are handed to each worker, balanced by number of candles
+    group_ends = np.cumsum(group_sizes)
+    bounds = np.searchsorted(group_ends, np.linspace(0, group_ends[-1], processes + 1)[1:-1])
+    batches = np.split(np.arange(len(group_sizes)), np.unique(bounds))
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = []
+
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+
+            start = group_ends[batch[0]] - group_sizes[batch[0]]
+            end = group_ends[batch[-1]]
+            futures.append(executor.submit(__scan_panel_arrays,
+                                           *[values[start:end] for values in columns],
+                                           group_sizes[batch],
+                                           patterns,
+                                           scores))
+
+        return np.concatenate([future.result() for future in futures])
+
+
+def __panel_columns(candles, ohlc, symbol_column, time_column):
+    # Columns of every symbol one after the other, ordered by time, with the
+    # number of candles of each symbol and the frame row of each candle
+    if not ohlc or len(ohlc) != 4:
+        raise Exception('Provide list of four elements indicating columns in strings. '
+                        'Default: [open, high, low, close]')
+
+    if isinstance(candles, dict):
+        symbols = list(candles)
+        group_sizes = np.array([len(candles[symbol][ohlc[3]]) for symbol in symbols], dtype=np.int64)
+        columns = [np.concatenate([__panel_array(candles[symbol][column]) for symbol in symbols])
+                   if symbols else np.zeros(0)
+                   for column in ohlc]
+
+        return columns, group_sizes, symbols, None
+
+    if not isinstance(candles, pd.DataFrame):
+        raise Exception('Candles must be in Panda data frame type or a dict of symbols')
+
+    required_columns = list(ohlc) + [symbol_column] + ([time_column] if time_column else [])
+    if not set(required_columns).issubset(candles.columns):
+        raise Exception('Provided columns does not exist in given data frame')
+
+    # Rows are grouped by symbol and ordered by time without copying the frame
+    codes, symbols = pd.factorize(candles[symbol_column])
+    if time_column:
+        order = np.lexsort((candles[time_column].to_numpy(), codes))
+    else:
+        order = np.argsort(codes, kind='stable')
+
+    group_sizes = np.bincount(codes, minlength=len(symbols))
+    columns = [__panel_array(candles[column])[order] for column in ohlc]
+
+    return columns, group_sizes, list(symbols), order
+
+
+def scan_panel(candles,
+               patterns=None,
+               ohlc=__default_ohlc,
+               symbol_column='symbol',
+               time_column='time',
+               processes=None):
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    patterns = list(patterns)
+    columns, group_sizes, symbols, order = __panel_columns(candles, ohlc, symbol_column, time_column)
+    results = __scan_panel(columns, group_sizes, patterns, processes)
+
+    if order is None:
+        found = dict()
+
+        for symbol, symbol_results in zip(symbols, np.split(results, np.cumsum(group_sizes)[:-1])):
+            index = candles[symbol].index if isinstance(candles[symbol], pd.DataFrame) else None
+            found[symbol] = pd.DataFrame(symbol_results, index=index, columns=patterns)
+
+        return found
+
+    found = np.empty((len(candles), len(patterns)), dtype=bool)
+    found[order] = results
+
+    return pd.DataFrame(found, index=candles.index, columns=patterns)
+
+
+def scan_top(candles,
+             k=10,
+             patterns=None,
+             ohlc=__default_ohlc,
+             symbol_column='symbol',
+             time_column='time',
+             processes=None):
+    if k < 1:
+        raise Exception('At least one signal must be asked for')
+
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    patterns = list(patterns)
+    columns, group_sizes, symbols, order = __panel_columns(candles, ohlc, symbol_column, time_column)
+    scores = __scan_panel(columns, group_sizes, patterns, processes, scores=True).ravel()
+
+    # Only the k strongest hits are sorted, the rest are just partitioned away
+    found = np.flatnonzero(~np.isnan(scores))
+    if len(found) > k:
+        found = found[np.argpartition(-scores[found], k - 1)[:k]]
+
+    found = found[np.lexsort((found, -scores[found]))]
+    rows, col_idxs = np.divmod(found, len(patterns))
+
+    group_ends = np.cumsum(group_sizes)
+    groups = np.searchsorted(group_ends, rows, side='right')
+
+    if order is None:
+        positions = rows - (group_ends - group_sizes)[groups]
+        labels = [candles[symbols[group]].index[position]
+                  if isinstance(candles[symbols[group]], pd.DataFrame) else position
+                  for group, position in zip(groups, positions)]
+    else:
+        labels = candles.index[order[rows]]
+
+    return pd.DataFrame({'symbol': [symbols[group] for group in groups],
+                         'row': labels,
+                         'pattern': [patterns[col_idx] for col_idx in col_idxs],
+                         'score': scores[found]},
+                        columns=['symbol', 'row', 'pattern', 'score'])
+
+
+def __scan_chunk(open, high, low, close, first_position, core, rows_len, patterns, is_reversed):
+    candles = CandleFeatures(open, high, low, close, first_position)
+    results = np.zeros((core.stop - core.start, len(patterns)), dtype=bool)
+
+    for col_idx, class_name in enumerate(patterns):
+        finder = registry.get_pattern(class_name)
+
+        if rows_len >= finder.required_count:
+            results[:, col_idx] = finder.detect(candles, is_reversed)[core]
+
+    return results
+
+
+def scan_chunked(candles_df,
+                 patterns=None,
+                 ohlc=__default_ohlc,
+                 is_reversed=False,
+                 chunk_size=1_000_000,
+                 processes=None):
+    if not isinstance(candles_df, (pd.DataFrame, CandleArray)):
+        raise Exception('Candles must be in Panda data frame type')
+
+    if chunk_size < 1:
+        raise Exception('Chunk size must be positive')
+
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    patterns = list(patterns)
+
+    if isinstance(candles_df, CandleArray):
+        columns = [candles_df.open, candles_df.high, candles_df.low, candles_df.close]
+    else:
+        if not ohlc or len(ohlc) != 4:
+            raise Exception('Provide list of four elements indicating columns in strings. '
+                            'Default: [open, high, low, close]')
+
+        if not set(ohlc).issubset(candles_df.columns):
+            raise Exception('Provided columns does not exist in given data frame')
+
+        columns = [CandleFeatures.to_array(candles_df[column]) for column in ohlc]
+
+    # Every chunk carries the candles its patterns look back on (and ahead
+    # on, in reversed order), so its own rows come out exactly as they would
+    # from scanning the whole series at once
+    rows_len = len(candles_df)
+    halo = max([registry.get_pattern(class_name).required_count for class_name in patterns] + [1]) - 1
+    chunks = []
+
+    for start in range(0, rows_len, chunk_size):
+        end = min(start + chunk_size, rows_len)
+        before = min(start, halo)
+        after = min(rows_len - end, halo) if is_reversed else 0
+        chunk = [values[start - before:end + after] for values in columns]
+
+        # Patterns with a fixed look back wrap around to the last candles on
+        # the first rows in reversed order, like DataFrame.iloc does
+        if is_reversed and start == 0 and halo:
+            chunk = [np.concatenate([values[-halo:], part]) for values, part in zip(columns, chunk)]
+            before = halo
+
+        chunks.append(chunk + [start - before, slice(before, before + end - start)])
+
+    if not processes or processes < 2 or len(chunks) < 2:
+        results = [__scan_chunk(*chunk, rows_len, patterns, is_reversed) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(__scan_chunk, *chunk, rows_len, patterns, is_reversed) for chunk in chunks]
+            results = [future.result() for future in futures]
+
+    results = np.concatenate(results) if results else np.zeros((0, len(patterns)), dtype=bool)
+    return pd.DataFrame(results, index=candles_df.index, columns=patterns)
@@ -0,0 +1,169 @@
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from . import candlestick, registry
+from .patterns.candle_array import CandleArray
+
+default_ohlc = ['open', 'high', 'low', 'close']
+
+epoch_ms = CandleArray.epoch_ms
+
+
+class OccurrenceIndex(object):
+    def __init__(self, max_bytes=None):
+        # symbol -> interval -> pattern -> sorted epoch ms times of the
+        # candles the pattern was found on, and for each symbol, interval and
+        # pattern the time of the last candle checked
+        self.max_bytes = max_bytes
+        self.__occurrences = {}
+        self.__checked = {}
+        # (symbol, interval) -> bytes of its times, least recently extended
+        # first
+        self.__series = OrderedDict()
+        self.__bytes = 0
+        self.__lock = threading.Lock()
+
+    @property
+    def nbytes(self):
+        return self.__bytes
+
+    def symbols(self):
+        return list(self.__occurrences)
+
+    def checked_until(self, symbol, interval, pattern=None):
+        # Without a pattern, the time every pattern indexed for the symbol
+        # and interval is checked until
+        if pattern is not None:
+            return self.__checked.get((symbol, interval, pattern))
+
+        checked = [value for key, value in self.__checked.items() if key[:2] == (symbol, interval)]
+        return min(checked) if checked else None
+
+    def times(self, symbol, interval, pattern):
+        return self.__occurrences.get(symbol, {}).get(interval, {}).get(pattern, np.zeros(0, dtype=np.int64))
+
+    def last(self, symbol, interval, pattern, count, before=None):
+        times = self.times(symbol, interval, pattern)
+        end = len(times) if before is None else np.searchsorted(times, epoch_ms(before), side='left')
+
+        return times[max(end - count, 0):end]
+
+    def between(self, symbol, interval, pattern, start, end):
+        times = self.times(symbol, interval, pattern)
+
+        return times[np.searchsorted(times, epoch_ms(start), side='left'):
+                     np.searchsorted(times, epoch_ms(end), side='right')]
+
+    def add(self, symbol, interval, pattern, times):
+        times = np.asarray(times, dtype=np.int64)
+
+        with self.__lock:
+            patterns = self.__occurrences.setdefault(symbol, {}).setdefault(interval, {})
+            previous = patterns.get(pattern)
+            patterns[pattern] = np.unique(times) if previous is None else np.union1d(previous, times)
+
+            added = patterns[pattern].nbytes - (0 if previous is None else previous.nbytes)
+            self.__series[(symbol, interval)] = self.__series.pop((symbol, interval), 0) + added
+            self.__bytes += added
+
+    def extend(self,
+               symbol,
+               interval,
+               candles_df,
+               patterns=None,
+               ohlc=default_ohlc,
+               time_column=None):
+        # Closed candles only: a candle still forming may lose its pattern.
+        # For each pattern, candles up to the last one already checked for it
+        # are skipped, apart from those the new candles' patterns look back on.
+        if patterns is None:
+            patterns = registry.pattern_names()
+
+        times = CandleArray.to_epoch_ms(candles_df[time_column] if time_column else candles_df.index)
+
+        starts = {}
+        for pattern in patterns:
+            checked = self.checked_until(symbol, interval, pattern)
+            start = 0 if checked is None else int(np.searchsorted(times, checked, side='right'))
+            if start < len(times):
+                starts[pattern] = start
+
+        if not starts:
+            self.touch(symbol, interval)
+            return 0
+
+        first = min(starts.values())
+        lookback = max(registry.get_pattern(pattern).required_count for pattern in starts) - 1
+        lookback_start = max(first - lookback, 0)
+
+        found = candlestick.scan_all(candles_df[lookback_start:], list(starts), ohlc).to_numpy()
+
+        for col_idx, (pattern, start) in enumerate(starts.items()):
+            self.add(symbol, interval, pattern, times[start:][found[start - lookback_start:, col_idx]])
+
+        with self.__lock:
+            for pattern in starts:
+                self.__checked[(symbol, interval, pattern)] = int(times[-1])
+
+        self.touch(symbol, interval)
+        self.evict()
+
+        return len(times) - first
+
+    def touch(self, symbol, interval):
+        with self.__lock:
+            if (symbol, interval) in self.__series:
+                self.__series.move_to_end((symbol, interval))
+
+    def evict(self):
+        # Least recently extended symbols and intervals are dropped with
+        # their checked times, so they are scanned again when next extended
+        with self.__lock:
+            while self.max_bytes is not None and self.__bytes > self.max_bytes and len(self.__series) > 1:
+                (symbol, interval), evicted = self.__series.popitem(last=False)
+                self.__bytes -= evicted
+
+                intervals = self.__occurrences[symbol]
+                del intervals[interval]
+                if not intervals:
+                    del self.__occurrences[symbol]
+
+                for key in [key for key in self.__checked if key[:2] == (symbol, interval)]:
+                    del self.__checked[key]
+
+    def save(self, path):
+        # All times in one array, with the symbol, interval and pattern of
+        # each run of it
+        with self.__lock:
+            entries = [(symbol, interval, pattern, times)
+                       for symbol, intervals in self.__occurrences.items()
+                       for interval, patterns in intervals.items()
+                       for pattern, times in patterns.items()]
+            checked = list(self.__checked.items())
+
+        np.savez(path,
+                 entries=np.array([entry[:3] for entry in entries], dtype=str).reshape(-1, 3),
+                 offsets=np.cumsum([0] + [len(entry[3]) for entry in entries]),
+                 times=np.concatenate([entry[3] for entry in entries] + [np.zeros(0, dtype=np.int64)]),
+                 series=np.array([key for key, _ in checked], dtype=str).reshape(-1, 3),
+                 checked=np.array([value for _, value in checked], dtype=np.int64))
+
+    @classmethod
+    def load(cls, path, max_bytes=None):
+        index = cls(max_bytes)
+
+        with np.load(path) as saved:
+            offsets = saved['offsets']
+            times = saved['times']
+
+            for entry_idx, (symbol, interval, pattern) in enumerate(saved['entries'].tolist()):
+                index.add(symbol, interval, pattern, times[offsets[entry_idx]:offsets[entry_idx + 1]])
+
+            for key, value in zip(saved['series'].tolist(), saved['checked'].tolist()):
+                index.__checked[tuple(key)] = value
+
+        index.evict()
+
+        return index
@@ -1,9 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class BearishEngulfing(CandlestickFinder):
+    required_count = 2
+    direction = 'bearish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -30,3 +33,19 @@ class BearishEngulfing(CandlestickFinder):
         #         abs(close - open) / (high - low) >= 0.7 and
         #         prev_high < open and
         #         prev_low > close)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return ((candle.open >= prev_candle.close) & prev_candle.bullish &
+                candle.bearish &
+                (prev_candle.open >= candle.close) &
+                (candle.body > prev_candle.body))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How deeply the body covers the previous one
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 1 - prev_candle.body / candle.body
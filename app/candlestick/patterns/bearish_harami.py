@@ -1,9 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class BearishHarami(CandlestickFinder):
+    required_count = 2
+    direction = 'bearish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -27,4 +30,19 @@ class BearishHarami(CandlestickFinder):
 
         return (prev_close > prev_open and
                 prev_open <= close < open <= prev_close and
-                open - close < prev_close - prev_open)
\ No newline at end of file
+                open - close < prev_close - prev_open)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return (prev_candle.bullish &
+                (prev_candle.open <= candle.close) & candle.bearish & (candle.open <= prev_candle.close) &
+                (candle.body < prev_candle.body))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How small the body is inside the previous one
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 1 - candle.body / prev_candle.body
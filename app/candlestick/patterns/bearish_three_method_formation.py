@@ -1,8 +1,11 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 class BearishThreeMethodFormation(CandlestickFinder):
+    required_count = 5  # This pattern needs at least 5 candles
+    direction = 'bearish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 5, target=target)  # This pattern needs at least 5 candles
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         if idx < 4:
@@ -27,4 +30,32 @@ class BearishThreeMethodFormation(CandlestickFinder):
                    (fourth_candle[self.high_column] <= first_candle[self.high_column] and \
                     fourth_candle[self.low_column] >= first_candle[self.low_column]):
                     return True
-        return False
\ No newline at end of file
+        return False
+
+    def vectorized_logic(self, candles, multi_coeff):
+        first_candle = candles.at(-4)
+        second_candle = candles.at(-3)
+        third_candle = candles.at(-2)
+        fourth_candle = candles.at(-1)
+        final_candle = candles.at(0)
+
+        # Check the first and final candles are bearish
+        direction = first_candle.bearish & final_candle.bearish
+        # Check the final candle closes below the first candle's close
+        breakout = final_candle.close < first_candle.close
+        # Check all middle candles are contained within the first candle's range
+        contained = ((second_candle.high <= first_candle.high) &
+                     (second_candle.low >= first_candle.low) &
+                     (third_candle.high <= first_candle.high) &
+                     (third_candle.low >= first_candle.low) &
+                     (fourth_candle.high <= first_candle.high) &
+                     (fourth_candle.low >= first_candle.low))
+
+        # Ensure there are enough candles before this point
+        return (candles.positions >= 4) & direction & breakout & contained
+
+    def vectorized_score(self, candles, multi_coeff):
+        # Size of the final candle compared to the first one, r / (1 + r)
+        # so that a final candle as large as the first one scores 0.5
+        ratio = candles.at(0).body / candles.at(-4).body
+        return ratio / (1 + ratio)
@@ -1,9 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class BullishHarami(CandlestickFinder):
+    required_count = 2
+    direction = 'bullish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -28,3 +31,18 @@ class BullishHarami(CandlestickFinder):
         return (prev_open > prev_close and
                 prev_close <= open < close <= prev_open and
                 close - open < prev_open - prev_close)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return (prev_candle.bearish &
+                (prev_candle.close <= candle.open) & candle.bullish & (candle.close <= prev_candle.open) &
+                (candle.body < prev_candle.body))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How small the body is inside the previous one
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 1 - candle.body / prev_candle.body
@@ -0,0 +1,182 @@
+import numbers
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_datetime64_any_dtype, is_numeric_dtype
+
+from .candle_features import CandleFeatures
+
+
+class CandleArray(object):
+    __slots__ = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+    price_columns = ('open', 'high', 'low', 'close')
+
+    def __init__(self, open, high, low, close, time=None, volume=None, dtype=np.float64):
+        # Columns already contiguous in the requested type, including
+        # read-only memory maps, are kept as they are instead of copied
+        self.open = np.ascontiguousarray(open, dtype=dtype)
+        self.high = np.ascontiguousarray(high, dtype=dtype)
+        self.low = np.ascontiguousarray(low, dtype=dtype)
+        self.close = np.ascontiguousarray(close, dtype=dtype)
+        self.volume = None if volume is None else np.ascontiguousarray(volume, dtype=dtype)
+        self.time = None if time is None else np.ascontiguousarray(time, dtype=np.int64)
+
+        for values in (self.high, self.low, self.close, self.volume, self.time):
+            if values is not None and len(values) != len(self.open):
+                raise Exception('All candle columns must have the same length')
+
+    def __len__(self):
+        return len(self.close)
+
+    def __getitem__(self, column):
+        # A slice of candles shares memory with the columns it is taken from
+        if isinstance(column, slice):
+            return CandleArray(self.open[column],
+                               self.high[column],
+                               self.low[column],
+                               self.close[column],
+                               time=None if self.time is None else self.time[column],
+                               volume=None if self.volume is None else self.volume[column],
+                               dtype=self.dtype)
+
+        if column not in self.__slots__ or getattr(self, column) is None:
+            raise KeyError(column)
+
+        return getattr(self, column)
+
+    def features(self):
+        # The cached features of these candles, shared by every detector
+        # given the same candles
+        return CandleFeatures.from_array(self)
+
+    @property
+    def dtype(self):
+        return self.close.dtype
+
+    @property
+    def index(self):
+        if self.time is None:
+            return pd.RangeIndex(len(self))
+
+        return pd.DatetimeIndex(pd.to_datetime(self.time, unit='ms'))
+
+    @property
+    def nbytes(self):
+        return sum(getattr(self, column).nbytes
+                   for column in self.__slots__
+                   if getattr(self, column) is not None)
+
+    @staticmethod
+    def to_epoch_ms(values):
+        if is_numeric_dtype(values) and not is_datetime64_any_dtype(values):
+            return np.asarray(values, dtype=np.int64)
+
+        times = pd.DatetimeIndex(pd.to_datetime(values))
+        if times.tz is not None:
+            times = times.tz_convert(None)
+
+        return times.values.astype('datetime64[ms]').view(np.int64)
+
+    @staticmethod
+    def epoch_ms(value):
+        if isinstance(value, numbers.Integral):
+            return int(value)
+
+        return pd.Timestamp(value).value // 1_000_000
+
+    @staticmethod
+    def to_prices(values, dtype):
+        if not is_numeric_dtype(values):
+            values = pd.to_numeric(values)
+
+        return values.to_numpy(dtype=dtype)
+
+    @classmethod
+    def from_frame(cls,
+                   candles_df,
+                   ohlc=price_columns,
+                   time_column=None,
+                   volume_column=None,
+                   dtype=np.float64):
+        if not isinstance(candles_df, pd.DataFrame):
+            raise Exception('Candles must be in Panda data frame type')
+
+        columns = list(ohlc) + [column for column in (time_column, volume_column) if column]
+        if not set(columns).issubset(candles_df.columns):
+            raise Exception('Provided columns does not exist in given data frame')
+
+        if time_column:
+            time = cls.to_epoch_ms(candles_df[time_column])
+        elif isinstance(candles_df.index, pd.DatetimeIndex):
+            time = cls.to_epoch_ms(candles_df.index)
+        else:
+            time = None
+
+        return cls(*[cls.to_prices(candles_df[column], dtype) for column in ohlc],
+                   time=time,
+                   volume=cls.to_prices(candles_df[volume_column], dtype) if volume_column else None,
+                   dtype=dtype)
+
+    @classmethod
+    def from_csv(cls,
+                 path,
+                 ohlc=price_columns,
+                 time_column='date',
+                 volume_column=None,
+                 dtype=np.float64):
+        # Only the needed columns are parsed, straight into the price type
+        columns = list(ohlc) + [column for column in (time_column, volume_column) if column]
+        prices = {column: dtype for column in columns if column != time_column}
+        candles_df = pd.read_csv(path, usecols=columns, dtype=prices)
+
+        return cls.from_frame(candles_df, ohlc, time_column, volume_column, dtype)
+
+    @staticmethod
+    def time_path(path):
+        root, extension = os.path.splitext(path)
+        return root + '.time' + extension
+
+    def save(self, path):
+        # Prices are one (columns, candles) block, so each column of the
+        # memory map stays contiguous. Times are kept next to it as int64.
+        columns = [getattr(self, column) for column in self.price_columns]
+        if self.volume is not None:
+            columns.append(self.volume)
+
+        np.save(path, np.stack(columns))
+
+        if self.time is not None:
+            np.save(self.time_path(path), self.time)
+
+    @classmethod
+    def load(cls, path, mmap_mode='r'):
+        prices = np.load(path, mmap_mode=mmap_mode)
+        time_path = cls.time_path(path)
+        time = np.load(time_path, mmap_mode=mmap_mode) if os.path.exists(time_path) else None
+
+        return cls(*prices[:4],
+                   time=time,
+                   volume=prices[4] if len(prices) > 4 else None,
+                   dtype=prices.dtype)
+
+    def to_frame(self):
+        columns = {column: getattr(self, column) for column in self.price_columns}
+        if self.volume is not None:
+            columns['volume'] = self.volume
+
+        return pd.DataFrame(columns, index=self.index)
+
+
+def search_prices(data):
+    # Closes chart detectors search: the (cached) log closes of candles, or
+    # the closes of a transform already rescaling them. Arrays are searched
+    # as they are given.
+    if isinstance(data, CandleArray):
+        data = data.features()
+
+    if isinstance(data, CandleFeatures):
+        return data.prices
+
+    return data
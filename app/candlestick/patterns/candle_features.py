@@ -0,0 +1,307 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+from . import transforms
+
+
+class CandleFeatures(object):
+    # Bytes of the cached features, derived columns included. The features
+    # used last are kept even when they alone take more.
+    cache_bytes = 128 * 1024 * 1024
+    __cache = OrderedDict()
+    __cache_lock = threading.Lock()
+
+    def __init__(self, open, high, low, close, first_position=0):
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        # Position of the first candle in the whole series, when these
+        # candles are only a chunk of it
+        self.first_position = first_position
+        self.rescaled = False
+        self.__shifted = {}
+        self.__trends = {}
+        self.__transforms = {}
+
+    def __len__(self):
+        return len(self.close)
+
+    @classmethod
+    def from_frame(cls, candles_df, open_column, high_column, low_column, close_column, cached=True):
+        columns = [cls.to_array(candles_df[column])
+                   for column in (open_column, high_column, low_column, close_column)]
+
+        return cls.cached(*columns) if cached else cls(*columns)
+
+    @classmethod
+    def from_array(cls, candle_array, cached=True):
+        columns = [candle_array.open, candle_array.high, candle_array.low, candle_array.close]
+
+        return cls.cached(*columns) if cached else cls(*columns)
+
+    @classmethod
+    def cached(cls, open, high, low, close):
+        # The same candles passed again, by any detector, get back the
+        # features already computed for them instead of a fresh object.
+        # Finding them costs a hash of the prices, about 46 ms for 1M
+        # candles: a third of a full scan_all saved on a hit, but three
+        # times a single pattern, so single pattern checks do not cache.
+        key = cls.fingerprint(open, high, low, close)
+
+        with cls.__cache_lock:
+            if key in cls.__cache:
+                cls.__cache.move_to_end(key)
+                candles = cls.__cache[key]
+                cls.evict()
+                return candles
+
+        # Cached arrays are private copies, so later edits of the caller's
+        # frame can not leak into features computed for the old values.
+        # Read-only views of a frame still change with it, only read-only
+        # memory maps are kept as they are.
+        columns = []
+        for values in (open, high, low, close):
+            if values.flags.writeable or not cls.is_mapped(values) or \
+                    not np.issubdtype(values.dtype, np.floating):
+                values = np.array(values, dtype=np.result_type(values.dtype, np.float32))
+                values.flags.writeable = False
+            columns.append(values)
+
+        candles = cls(*columns)
+
+        with cls.__cache_lock:
+            candles = cls.__cache.setdefault(key, candles)
+            cls.__cache.move_to_end(key)
+            cls.evict()
+
+        return candles
+
+    @classmethod
+    def evict(cls):
+        # Derived columns grow the cached features after they are stored, so
+        # their size is taken again every time the cache is used
+        sizes = [candles.nbytes for candles in cls.__cache.values()]
+        total = sum(sizes)
+
+        for size in sizes[:-1]:
+            if total <= cls.cache_bytes:
+                break
+
+            cls.__cache.popitem(last=False)
+            total -= size
+
+    @staticmethod
+    def is_mapped(values):
+        while values is not None:
+            if isinstance(values, np.memmap):
+                return True
+            values = values.base
+
+        return False
+
+    @classmethod
+    def clear_cache(cls):
+        with cls.__cache_lock:
+            cls.__cache.clear()
+
+    @staticmethod
+    def fingerprint(*columns):
+        digest = hashlib.blake2b(digest_size=16)
+
+        for values in columns:
+            values = np.ascontiguousarray(values)
+            digest.update(str((values.dtype.str, values.shape)).encode())
+            digest.update(values.data)
+
+        return digest.hexdigest()
+
+    @staticmethod
+    def to_array(column):
+        if not is_numeric_dtype(column):
+            column = pd.to_numeric(column)
+
+        return column.to_numpy(dtype=np.float64)
+
+    @property
+    def nbytes(self):
+        # Arrays owned by these features: the cached columns and every
+        # feature derived from them so far, views of other arrays left out
+        arrays = [values for values in vars(self).values() if isinstance(values, np.ndarray)]
+        arrays += [values
+                   for shifted in self.__shifted.values()
+                   for values in vars(shifted).values()
+                   if isinstance(values, np.ndarray)]
+        arrays += self.__trends.values()
+
+        return sum(values.nbytes for values in arrays if values.base is None) + \
+            sum(candles.nbytes for candles in self.__transforms.values())
+
+    def expand(self):
+        # Columns as (rows, 1) views, so comparing them with an array of
+        # thresholds broadcasts into a (rows, thresholds) result
+        return CandleFeatures(self.open[:, np.newaxis],
+                              self.high[:, np.newaxis],
+                              self.low[:, np.newaxis],
+                              self.close[:, np.newaxis],
+                              self.first_position)
+
+    @cached_property
+    def positions(self):
+        positions = np.arange(self.first_position, self.first_position + len(self))
+        return positions.reshape((-1,) + (1,) * (self.close.ndim - 1))
+
+    @cached_property
+    def body(self):
+        return abs(self.close - self.open)
+
+    @cached_property
+    def range(self):
+        return self.high - self.low
+
+    @cached_property
+    def body_ratio(self):
+        return self.body / self.range
+
+    @cached_property
+    def body_top(self):
+        return np.maximum(self.close, self.open)
+
+    @cached_property
+    def body_bottom(self):
+        return np.minimum(self.close, self.open)
+
+    @cached_property
+    def upper_shadow(self):
+        return self.high - self.body_top
+
+    @cached_property
+    def lower_shadow(self):
+        return self.body_bottom - self.low
+
+    @cached_property
+    def direction(self):
+        # 1 for bullish candles, -1 for bearish ones and 0 when open equals close
+        return np.sign(self.close - self.open)
+
+    @cached_property
+    def bullish(self):
+        return self.close > self.open
+
+    @cached_property
+    def bearish(self):
+        return self.close < self.open
+
+    @cached_property
+    def log_open(self):
+        return np.log(self.open)
+
+    @cached_property
+    def log_high(self):
+        return np.log(self.high)
+
+    @cached_property
+    def log_low(self):
+        return np.log(self.low)
+
+    @cached_property
+    def log_close(self):
+        return np.log(self.close)
+
+    @cached_property
+    def prices(self):
+        # Closes as chart detectors search them: their logs, unless a
+        # transform already rescaled them
+        return self.close if self.rescaled else self.log_close
+
+    def trend(self, bars, method='return', is_reversed=False):
+        # Trend of the `bars` candles ending at each candle, NaN until there
+        # are that many: the log return over them or the least squares slope
+        # of their log closes. Reversed candles are measured back in time.
+        key = (bars, method, is_reversed)
+
+        if key not in self.__trends:
+            log_close = self.log_close.reshape(len(self), -1)[:, 0]
+            if is_reversed:
+                log_close = log_close[::-1]
+
+            trend = np.full(len(log_close), np.nan)
+
+            if method == 'return':
+                trend[bars:] = log_close[bars:] - log_close[:-bars]
+            elif method == 'slope':
+                if bars < 2:
+                    raise Exception('A slope needs at least two candles')
+
+                # Window sums of y and x * y from cumulative sums, with x
+                # counted from the start of each window
+                x = np.arange(len(log_close), dtype=np.float64)
+                sums_y = np.concatenate([[0], np.cumsum(log_close)])
+                sums_xy = np.concatenate([[0], np.cumsum(x * log_close)])
+
+                window_y = sums_y[bars:] - sums_y[:-bars]
+                window_xy = sums_xy[bars:] - sums_xy[:-bars] - x[:len(window_y)] * window_y
+                trend[bars - 1:] = (window_xy - (bars - 1) / 2 * window_y) / (bars * (bars ** 2 - 1) / 12)
+            else:
+                raise Exception('Trend method must be one of return or slope')
+
+            self.__trends[key] = trend[::-1] if is_reversed else trend
+
+        return self.__trends[key]
+
+    def transform(self, name):
+        # Candles of a price transform, like heikin_ashi, log or zscore,
+        # computed once and kept with the candles they come from
+        if name not in self.__transforms:
+            columns = []
+            for values in transforms.apply(name, self):
+                values = values.view()
+                values.flags.writeable = False
+                columns.append(values)
+
+            candles = CandleFeatures(*columns, self.first_position)
+            candles.rescaled = name in transforms.rescaled
+            self.__transforms[name] = candles
+
+        return self.__transforms[name]
+
+    def take(self, rows):
+        # Only the given candles, in that order, keeping their positions
+        candles = CandleFeatures(self.open[rows], self.high[rows], self.low[rows], self.close[rows])
+        candles.positions = self.positions[rows]
+        return candles
+
+    def at(self, offset):
+        # Row i of the result holds the candle at iloc[i + offset]. Negative
+        # positions wrap around to the end exactly like DataFrame.iloc does.
+        if offset == 0:
+            return self
+
+        if offset not in self.__shifted:
+            self.__shifted[offset] = ShiftedCandleFeatures(self, offset)
+        return self.__shifted[offset]
+
+
+class ShiftedCandleFeatures(object):
+    def __init__(self, candles, offset):
+        self.candles = candles
+        self.offset = offset
+
+    def __len__(self):
+        return len(self.candles)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+
+        # Shift the column computed on the unshifted candles instead of
+        # recomputing it, and keep it for the next pattern asking for it
+        values = np.roll(getattr(self.candles, name), -self.offset, axis=0)
+        setattr(self, name, values)
+        return values
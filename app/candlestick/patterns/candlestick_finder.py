@@ -1,11 +1,25 @@
+import copy
+
+import numpy as np
 import pandas as pd
 from pandas.api.types import is_numeric_dtype
 
+from .candle_array import CandleArray
+from .candle_features import CandleFeatures
+from .hits import Hits
+
 
 class CandlestickFinder(object):
-    def __init__(self, name, required_count, target=None):
+    required_count = 1
+    direction = 'neutral'
+    # Trend a reversal pattern must follow, up or down, to be looked for
+    prior_trend = None
+
+    def __init__(self, name, required_count, target=None, trend_bars=None, trend_method='return'):
         self.name = name
         self.required_count = required_count
+        self.trend_bars = trend_bars
+        self.trend_method = trend_method
         self.close_column = 'close'
         self.open_column = 'open'
         self.low_column = 'low'
@@ -25,35 +39,281 @@ class CandlestickFinder(object):
     def logic(self, row_idx):
         raise Exception('Implement the logic of ' + self.get_class_name())
 
+    def vectorized_logic(self, candles, multi_coeff):
+        raise Exception('Implement the vectorized logic of ' + self.get_class_name())
+
+    def valid_rows(self, rows_len, is_reversed):
+        # Rows having enough neighbouring candles to be checked, the rest are None
+        positions = np.arange(rows_len)
+
+        if is_reversed:
+            return positions <= rows_len - self.required_count
+        else:
+            return positions >= self.required_count - 1
+
+    def trend_gate(self, candles, is_reversed):
+        # Candles following the trend the pattern reverses, measured over the
+        # candles before its first one. None when the pattern is not gated.
+        if not self.trend_bars or self.prior_trend is None:
+            return None
+
+        trend = candles.trend(self.trend_bars, self.trend_method, is_reversed)
+        prior = np.full(len(candles), np.nan)
+
+        if is_reversed:
+            prior[:len(candles) - self.required_count] = trend[self.required_count:]
+        else:
+            prior[self.required_count:] = trend[:len(candles) - self.required_count]
+
+        with np.errstate(invalid='ignore'):
+            return prior < 0 if self.prior_trend == 'down' else prior > 0
+
+    def gated_logic(self, candles, gate, multi_coeff):
+        rows = np.flatnonzero(gate)
+        span = 2 * self.required_count - 1
+
+        if len(rows) * span >= len(candles):
+            found = np.asarray(self.vectorized_logic(candles, multi_coeff), dtype=bool)
+            return found & gate.reshape((-1,) + (1,) * (found.ndim - 1))
+
+        # Only candles passing the gate are checked, each with the candles
+        # around it. Positions out of the series wrap like the full check.
+        taken = (rows[:, np.newaxis] + np.arange(1 - self.required_count, self.required_count)) % len(candles)
+        checked = np.asarray(self.vectorized_logic(candles.take(taken.ravel()), multi_coeff), dtype=bool)
+
+        found = np.zeros((len(candles),) + checked.shape[1:], dtype=bool)
+        found[rows] = checked[self.required_count - 1::span]
+        return found
+
+    def detect(self, candles, is_reversed):
+        multi_coeff = 1 if is_reversed else -1
+        gate = self.trend_gate(candles, is_reversed)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if gate is None:
+                found = self.vectorized_logic(candles, multi_coeff)
+            else:
+                found = self.gated_logic(candles, gate, multi_coeff)
+
+        found = np.asarray(found, dtype=bool)
+        valid = self.valid_rows(len(candles), is_reversed)
+
+        return found & valid.reshape((-1,) + (1,) * (found.ndim - 1))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # Every hit is equally strong unless a pattern tells them apart
+        return np.ones(np.shape(candles.close))
+
+    def score(self, candles, is_reversed):
+        # Strength of each hit from 0, barely the pattern, to 1, the
+        # clearest form of it. Candles without the pattern are NaN.
+        multi_coeff = 1 if is_reversed else -1
+        found = self.detect(candles, is_reversed)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.asarray(self.vectorized_score(candles, multi_coeff), dtype=np.float64)
+
+        return np.where(found, np.clip(np.broadcast_to(scores, found.shape), 0, 1), np.nan)
+
     def has_pattern(self,
                     candles_df,
                     ohlc,
-                    is_reversed):
-        self.prepare_data(candles_df,
-                          ohlc)
+                    is_reversed,
+                    vectorized=True,
+                    output='frame',
+                    inplace=False,
+                    last=None,
+                    since=None,
+                    time_column=None,
+                    transform=None):
+        if output not in ('frame', 'series', 'array', 'hits'):
+            raise Exception('Output must be one of frame, series, array or hits')
+
+        if transform is not None and (last is not None or since is not None or not vectorized):
+            raise Exception('Transforms are only applied by the vectorized check of all candles')
+
+        if last is not None or since is not None:
+            if is_reversed:
+                raise Exception('Recent candles can only be checked in chronological order')
+
+            return self.has_pattern_window(candles_df, ohlc, last, since, time_column, output, inplace)
+
+        if not vectorized:
+            if isinstance(candles_df, CandleArray):
+                candles_df, ohlc = candles_df.to_frame(), list(CandleArray.price_columns)
+
+            return self.has_pattern_by_row(candles_df, ohlc, is_reversed)
+
+        # Columns are read straight from the given frame, only non numeric
+        # ones are converted, so no copy of the whole frame is made. The
+        # shared feature cache is skipped too: hashing the candles to find
+        # them costs more than the features of a single pattern. Nothing
+        # is stored on the finder, so one instance can serve many threads.
+        self.check_data(candles_df, ohlc)
+
+        rows_len = len(candles_df)
+
+        if isinstance(candles_df, CandleArray):
+            candles = CandleFeatures.from_array(candles_df, cached=False)
+
+            # Only a frame result needs the candles as a frame
+            if output == 'frame' or inplace:
+                candles_df = candles_df.to_frame()
+        else:
+            candles = CandleFeatures.from_frame(candles_df, *ohlc, cached=False)
+
+        if transform is not None:
+            candles = candles.transform(transform)
+
+        found = self.detect(candles, is_reversed)
+        valid = self.valid_rows(rows_len, is_reversed)
+
+        if inplace or output == 'series':
+            # Nullable booleans, rows without enough candles around them are NA
+            result = pd.Series(pd.arrays.BooleanArray(found, ~valid),
+                               index=candles_df.index,
+                               name=self.target)
+
+            if inplace:
+                candles_df[self.target] = result
+                return candles_df
+
+            return result
+
+        if output == 'array':
+            return found
+
+        if output == 'hits':
+            return self.hits(candles_df, np.flatnonzero(found), rows_len, time_column)
 
-        if self.is_data_prepared:
+        idxs = candles_df.index.values
+        values = found.tolist()
+
+        for row_idx in np.flatnonzero(~valid):
+            values[row_idx] = None
+
+        if is_reversed:
+            idxs = idxs[::-1]
+            values = values[::-1]
+
+        candles_df = candles_df.join(pd.DataFrame({'row': idxs, self.target: values}).set_index('row'),
+                                     how='outer')
+
+        return candles_df
+
+    def hits(self, candles_df, positions, rows_len, time_column=None):
+        # Times are only converted for the candles a pattern was found on
+        if isinstance(candles_df, CandleArray):
+            times = None if candles_df.time is None else candles_df.time[positions]
+        elif time_column:
+            times = CandleArray.to_epoch_ms(candles_df[time_column].iloc[positions])
+        elif isinstance(candles_df.index, pd.DatetimeIndex):
+            times = CandleArray.to_epoch_ms(candles_df.index[positions])
+        else:
+            times = None
+
+        return Hits(positions, rows_len, times)
+
+    def window_start(self, candles_df, last=None, since=None, time_column=None):
+        if last is not None:
+            return max(len(candles_df) - last, 0)
+
+        # A CandleArray keeps its times as epoch ms
+        if isinstance(candles_df, CandleArray):
+            if candles_df.time is None:
+                raise Exception('Candles have no times to start the window from')
+
+            return int(np.searchsorted(candles_df.time, CandleArray.epoch_ms(since)))
+
+        times = candles_df[time_column] if time_column else candles_df.index
+        return int(times.searchsorted(since))
+
+    def has_pattern_window(self,
+                           candles_df,
+                           ohlc,
+                           last=None,
+                           since=None,
+                           time_column=None,
+                           output='frame',
+                           inplace=False):
+        self.check_data(candles_df, ohlc)
+
+        # Only the window and the candles its first rows look back on are
+        # checked, which gives the same answer a scan of all candles would
+        rows_len = len(candles_df)
+        start = self.window_start(candles_df, last, since, time_column)
+        lookback_start = max(min(start - (self.required_count - 1), rows_len - self.required_count), 0)
+
+        if output == 'hits' and not inplace:
+            found = self.has_pattern(candles_df[lookback_start:], ohlc, False, output='array')
+            positions = np.flatnonzero(found[start - lookback_start:]) + start
+            return self.hits(candles_df, positions, rows_len, time_column)
+
+        result = self.has_pattern(candles_df[lookback_start:],
+                                  ohlc,
+                                  False,
+                                  output='series' if inplace else output)
+
+        if output == 'array' and not inplace:
+            return result[start - lookback_start:]
+
+        result = result.iloc[start - lookback_start:]
+
+        if inplace:
+            if isinstance(candles_df, CandleArray):
+                candles_df = candles_df.to_frame()
+
+            # Candles before the window are left unchecked
+            column = pd.Series(pd.NA, index=candles_df.index, dtype='boolean', name=self.target)
+            column.iloc[start:] = result.array
+            candles_df[self.target] = column
+            return candles_df
+
+        return result
+
+    def has_pattern_by_row(self,
+                           candles_df,
+                           ohlc,
+                           is_reversed):
+        # The row logic reads the candles, their columns and the direction
+        # from the finder, so it runs on a copy of it. The shared instance
+        # keeps neither that state nor a copy of the frame.
+        finder = copy.copy(self)
+        finder.prepare_data(candles_df,
+                            ohlc)
+
+        if finder.is_data_prepared:
             results = []
             rows_len = len(candles_df)
             idxs = candles_df.index.values
 
+            # Candles failing the trend gate are not checked at all
+            gate = finder.trend_gate(CandleFeatures.from_frame(finder.data,
+                                                               finder.open_column,
+                                                               finder.high_column,
+                                                               finder.low_column,
+                                                               finder.close_column,
+                                                               cached=False), is_reversed)
+            if gate is None:
+                gate = np.ones(rows_len, dtype=bool)
+
             if is_reversed:
-                self.multi_coeff = 1
+                finder.multi_coeff = 1
 
                 for row_idx in range(rows_len - 1, -1, -1):
 
                     if row_idx <= rows_len - self.required_count:
-                        results.append([idxs[row_idx], self.logic(row_idx)])
+                        results.append([idxs[row_idx], bool(gate[row_idx]) and finder.logic(row_idx)])
                     else:
                         results.append([idxs[row_idx], None])
 
             else:
-                self.multi_coeff = -1
+                finder.multi_coeff = -1
 
                 for row in range(0, rows_len, 1):
 
                     if row >= self.required_count - 1:
-                        results.append([idxs[row], self.logic(row)])
+                        results.append([idxs[row], bool(gate[row]) and finder.logic(row)])
                     else:
                         results.append([idxs[row], None])
 
@@ -64,40 +324,48 @@ class CandlestickFinder(object):
         else:
             raise Exception('Data is not prepared to detect patterns')
 
-    def prepare_data(self, candles_df, ohlc):
+    def check_data(self, candles_df, ohlc):
 
-        if isinstance(candles_df, pd.DataFrame):
+        if isinstance(candles_df, CandleArray):
+            if len(candles_df) < self.required_count:
+                raise Exception('{0} requires at least {1} data'.format(self.name,
+                                                                        self.required_count))
+
+        elif isinstance(candles_df, pd.DataFrame):
 
             if len(candles_df) >= self.required_count:
                 if ohlc and len(ohlc) == 4:
                     if not set(ohlc).issubset(candles_df.columns):
                         raise Exception('Provided columns does not exist in given data frame')
-
-                    self.open_column = ohlc[0]
-                    self.high_column = ohlc[1]
-                    self.low_column = ohlc[2]
-                    self.close_column = ohlc[3]
                 else:
                     raise Exception('Provide list of four elements indicating columns in strings. '
                                     'Default: [open, high, low, close]')
+            else:
+                raise Exception('{0} requires at least {1} data'.format(self.name,
+                                                                        self.required_count))
+        else:
+            raise Exception('Candles must be in Panda data frame type')
 
-                self.data = candles_df.copy()
+    def prepare_data(self, candles_df, ohlc):
+        self.check_data(candles_df, ohlc)
 
-                if not is_numeric_dtype(self.data[self.close_column]):
-                    self.data[self.close_column] = pd.to_numeric(self.data[self.close_column])
+        self.open_column = ohlc[0]
+        self.high_column = ohlc[1]
+        self.low_column = ohlc[2]
+        self.close_column = ohlc[3]
 
-                if not is_numeric_dtype(self.data[self.open_column]):
-                    self.data[self.open_column] = pd.to_numeric(self.data[self.open_column])
+        self.data = candles_df.copy()
 
-                if not is_numeric_dtype(self.data[self.low_column]):
-                    self.data[self.low_column] = pd.to_numeric(self.data[self.low_column])
+        if not is_numeric_dtype(self.data[self.close_column]):
+            self.data[self.close_column] = pd.to_numeric(self.data[self.close_column])
 
-                if not is_numeric_dtype(self.data[self.high_column]):
-                    self.data[self.high_column] = pd.to_numeric(candles_df[self.high_column])
+        if not is_numeric_dtype(self.data[self.open_column]):
+            self.data[self.open_column] = pd.to_numeric(self.data[self.open_column])
 
-                self.is_data_prepared = True
-            else:
-                raise Exception('{0} requires at least {1} data'.format(self.name,
-                                                                        self.required_count))
-        else:
-            raise Exception('Candles must be in Panda data frame type')
+        if not is_numeric_dtype(self.data[self.low_column]):
+            self.data[self.low_column] = pd.to_numeric(self.data[self.low_column])
+
+        if not is_numeric_dtype(self.data[self.high_column]):
+            self.data[self.high_column] = pd.to_numeric(candles_df[self.high_column])
+
+        self.is_data_prepared = True
@@ -1,9 +1,13 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class DarkCloudCover(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+    required_count = 2
+    direction = 'bearish'
+
+    def __init__(self, target=None, min_body_ratio=0.6):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.min_body_ratio = min_body_ratio
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -31,4 +35,28 @@ class DarkCloudCover(CandlestickFinder):
                 (open > close) and
                 (open > prev_close) and
                 (close > prev_open) and
-                ((open - close) / (.001 + (high - low)) > 0.6))
+                ((open - close) / (.001 + (high - low)) > self.min_body_ratio))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        close = candle.close
+        open = candle.open
+
+        prev_close = prev_candle.close
+        prev_open = prev_candle.open
+
+        return (prev_candle.bullish &
+                (((prev_close + prev_open) / 2) > close) &
+                candle.bearish &
+                (open > prev_close) &
+                (close > prev_open) &
+                ((open - close) / (.001 + candle.range) > self.min_body_ratio))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the close goes down into the previous body, past its midpoint
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 2 * (prev_candle.close - candle.close) / prev_candle.body - 1
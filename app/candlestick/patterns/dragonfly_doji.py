@@ -1,9 +1,14 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class DragonflyDoji(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 1, target=target)
+    required_count = 1
+    direction = 'bullish'
+
+    def __init__(self, target=None, max_body_ratio=0.1, shadow_multiple=3):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.max_body_ratio = max_body_ratio
+        self.shadow_multiple = shadow_multiple
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -13,6 +18,19 @@ class DragonflyDoji(CandlestickFinder):
         high = candle[self.high_column]
         low = candle[self.low_column]
 
-        return abs(close - open) / (high - low) < 0.1 and \
-               (min(close, open) - low) > (3 * abs(close - open)) and \
+        return abs(close - open) / (high - low) < self.max_body_ratio and \
+               (min(close, open) - low) > (self.shadow_multiple * abs(close - open)) and \
                (high - max(close, open)) < abs(close - open)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+
+        return ((candle.body_ratio < self.max_body_ratio) &
+                (candle.lower_shadow > (self.shadow_multiple * candle.body)) &
+                (candle.upper_shadow < candle.body))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the body stays below the largest doji body
+        candle = candles.at(0)
+
+        return 1 - candle.body_ratio / self.max_body_ratio
@@ -1,9 +1,14 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class EveningStar(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 3, target=target)
+    required_count = 3
+    direction = 'bearish'
+    prior_trend = 'up'
+
+    def __init__(self, target=None, trend_bars=None, trend_method='return'):
+        super().__init__(self.get_class_name(), self.required_count, target=target,
+                         trend_bars=trend_bars, trend_method=trend_method)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -38,3 +43,20 @@ class EveningStar(CandlestickFinder):
 
         return (min(prev_open, prev_close) > b_prev_close > b_prev_open and
                 close < open < min(prev_open, prev_close))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        return ((prev_candle.body_bottom > b_prev_candle.close) & b_prev_candle.bullish &
+                candle.bearish & (candle.open < prev_candle.body_bottom))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How much of the first body the last candle gives back, r / (1 + r)
+        # so that winning all of it back scores 0.5
+        candle = candles.at(0)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        ratio = ((b_prev_candle.close - candle.close) / b_prev_candle.body).clip(min=0)
+        return ratio / (1 + ratio)
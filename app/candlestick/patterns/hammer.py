@@ -1,9 +1,16 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class Hammer(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 1, target=target)
+    required_count = 1
+    direction = 'bullish'
+    prior_trend = 'down'
+
+    def __init__(self, target=None, range_multiple=3, shadow_ratio=0.6, trend_bars=None, trend_method='return'):
+        super().__init__(self.get_class_name(), self.required_count, target=target,
+                         trend_bars=trend_bars, trend_method=trend_method)
+        self.range_multiple = range_multiple
+        self.shadow_ratio = shadow_ratio
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -13,6 +20,25 @@ class Hammer(CandlestickFinder):
         high = candle[self.high_column]
         low = candle[self.low_column]
 
-        return (((high - low) > 3 * (open - close)) and
-                ((close - low) / (.001 + high - low) > 0.6) and
-                ((open - low) / (.001 + high - low) > 0.6))
+        return (((high - low) > self.range_multiple * (open - close)) and
+                ((close - low) / (.001 + high - low) > self.shadow_ratio) and
+                ((open - low) / (.001 + high - low) > self.shadow_ratio))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+
+        close = candle.close
+        open = candle.open
+        high = candle.high
+        low = candle.low
+
+        return ((candle.range > self.range_multiple * (open - close)) &
+                ((close - low) / (.001 + high - low) > self.shadow_ratio) &
+                ((open - low) / (.001 + high - low) > self.shadow_ratio))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the lower shadow share of the range is past the threshold
+        candle = candles.at(0)
+        shadow = candle.lower_shadow / (.001 + candle.range)
+
+        return (shadow - self.shadow_ratio) / (1 - self.shadow_ratio)
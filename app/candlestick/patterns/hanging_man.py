@@ -1,9 +1,16 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class HangingMan(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 3, target=target)
+    required_count = 3
+    direction = 'bearish'
+    prior_trend = 'up'
+
+    def __init__(self, target=None, range_multiple=4, shadow_ratio=0.75, trend_bars=None, trend_method='return'):
+        super().__init__(self.get_class_name(), self.required_count, target=target,
+                         trend_bars=trend_bars, trend_method=trend_method)
+        self.range_multiple = range_multiple
+        self.shadow_ratio = shadow_ratio
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -31,8 +38,31 @@ class HangingMan(CandlestickFinder):
         #         high[1] < open and
         #         high[2] < open)
 
-        return (((high - low > 4 * (open - close)) and
-                 ((close - low) / (.001 + high - low) >= 0.75) and
-                 ((open - low) / (.001 + high - low) >= 0.75)) and
+        return (((high - low > self.range_multiple * (open - close)) and
+                 ((close - low) / (.001 + high - low) >= self.shadow_ratio) and
+                 ((open - low) / (.001 + high - low) >= self.shadow_ratio)) and
                 prev_high < open and
                 b_prev_high < open)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        close = candle.close
+        open = candle.open
+        high = candle.high
+        low = candle.low
+
+        return ((candle.range > self.range_multiple * (open - close)) &
+                ((close - low) / (.001 + high - low) >= self.shadow_ratio) &
+                ((open - low) / (.001 + high - low) >= self.shadow_ratio) &
+                (prev_candle.high < open) &
+                (b_prev_candle.high < open))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the lower shadow share of the range is past the threshold
+        candle = candles.at(0)
+        shadow = candle.lower_shadow / (.001 + candle.range)
+
+        return (shadow - self.shadow_ratio) / (1 - self.shadow_ratio)
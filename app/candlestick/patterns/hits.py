@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class Hits(object):
+    def __init__(self, positions, length, times=None):
+        # Sorted positions of the candles a pattern was found on, out of
+        # `length` candles, and their epoch ms times when those are known
+        self.positions = np.asarray(positions, dtype=np.int64)
+        self.length = int(length)
+        self.times = None if times is None else np.asarray(times, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.positions)
+
+    def __eq__(self, other):
+        return (isinstance(other, Hits) and
+                self.length == other.length and
+                np.array_equal(self.positions, other.positions) and
+                (self.times is None) == (other.times is None) and
+                (self.times is None or np.array_equal(self.times, other.times)))
+
+    def __repr__(self):
+        return 'Hits({0} of {1} candles)'.format(len(self), self.length)
+
+    @classmethod
+    def from_mask(cls, found, times=None):
+        positions = np.flatnonzero(found)
+
+        return cls(positions, len(found), None if times is None else times[positions])
+
+    def to_mask(self):
+        found = np.zeros(self.length, dtype=bool)
+        found[self.positions] = True
+        return found
+
+    def to_dict(self):
+        hits = {'length': self.length, 'positions': self.positions.tolist()}
+        if self.times is not None:
+            hits['times'] = self.times.tolist()
+        return hits
+
+    @classmethod
+    def from_dict(cls, hits):
+        return cls(hits['positions'], hits['length'], hits.get('times'))
+
+    def check_same_candles(self, other):
+        if self.length != other.length:
+            raise Exception('Hits must come from the same candles')
+
+    def select(self, kept):
+        return Hits(self.positions[kept], self.length, None if self.times is None else self.times[kept])
+
+    def intersection(self, other):
+        self.check_same_candles(other)
+        return self.select(np.isin(self.positions, other.positions, assume_unique=True))
+
+    def union(self, other):
+        self.check_same_candles(other)
+
+        positions, order = np.unique(np.concatenate([self.positions, other.positions]), return_index=True)
+        times = None
+        if self.times is not None and other.times is not None:
+            times = np.concatenate([self.times, other.times])[order]
+
+        return Hits(positions, self.length, times)
+
+    def difference(self, other):
+        self.check_same_candles(other)
+        return self.select(~np.isin(self.positions, other.positions, assume_unique=True))
+
+    def within(self, other, bars, before_only=False):
+        # Hits having a hit of `other` at most `bars` candles away, or only
+        # at most `bars` candles before them with before_only
+        self.check_same_candles(other)
+
+        upper = self.positions if before_only else self.positions + bars
+        nearest = np.searchsorted(other.positions, self.positions - bars, side='left')
+
+        kept = nearest < len(other)
+        kept[kept] = other.positions[nearest[kept]] <= upper[kept]
+
+        return self.select(kept)
@@ -1,9 +1,14 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class InvertedHammer(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 1, target=target)
+    required_count = 1
+    direction = 'bullish'
+
+    def __init__(self, target=None, range_multiple=3, shadow_ratio=0.6):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.range_multiple = range_multiple
+        self.shadow_ratio = shadow_ratio
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -13,6 +18,25 @@ class InvertedHammer(CandlestickFinder):
         high = candle[self.high_column]
         low = candle[self.low_column]
 
-        return (((high - low) > 3 * (open - close)) and
-                ((high - close) / (.001 + high - low) > 0.6)
-                and ((high - open) / (.001 + high - low) > 0.6))
+        return (((high - low) > self.range_multiple * (open - close)) and
+                ((high - close) / (.001 + high - low) > self.shadow_ratio)
+                and ((high - open) / (.001 + high - low) > self.shadow_ratio))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+
+        close = candle.close
+        open = candle.open
+        high = candle.high
+        low = candle.low
+
+        return ((candle.range > self.range_multiple * (open - close)) &
+                ((high - close) / (.001 + high - low) > self.shadow_ratio) &
+                ((high - open) / (.001 + high - low) > self.shadow_ratio))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the upper shadow share of the range is past the threshold
+        candle = candles.at(0)
+        shadow = candle.upper_shadow / (.001 + candle.range)
+
+        return (shadow - self.shadow_ratio) / (1 - self.shadow_ratio)
@@ -1,9 +1,14 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class MorningStar(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 3, target=target)
+    required_count = 3
+    direction = 'bullish'
+    prior_trend = 'down'
+
+    def __init__(self, target=None, trend_bars=None, trend_method='return'):
+        super().__init__(self.get_class_name(), self.required_count, target=target,
+                         trend_bars=trend_bars, trend_method=trend_method)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -38,3 +43,20 @@ class MorningStar(CandlestickFinder):
 
         return (max(prev_open, prev_close) < b_prev_close < b_prev_open and
                 close > open > max(prev_open, prev_close))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        return ((prev_candle.body_top < b_prev_candle.close) & b_prev_candle.bearish &
+                candle.bullish & (candle.open > prev_candle.body_top))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How much of the first body the last candle wins back, r / (1 + r)
+        # so that winning all of it back scores 0.5
+        candle = candles.at(0)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        ratio = ((candle.close - b_prev_candle.close) / b_prev_candle.body).clip(min=0)
+        return ratio / (1 + ratio)
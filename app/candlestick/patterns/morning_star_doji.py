@@ -1,9 +1,15 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class MorningStarDoji(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 3, target=target)
+    required_count = 3
+    direction = 'bullish'
+
+    def __init__(self, target=None, min_body_ratio=0.7, max_body_ratio=0.1, shadow_multiple=3):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.min_body_ratio = min_body_ratio
+        self.max_body_ratio = max_body_ratio
+        self.shadow_multiple = shadow_multiple
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -26,14 +32,38 @@ class MorningStarDoji(CandlestickFinder):
         b_prev_low = b_prev_candle[self.low_column]
 
         return (b_prev_close < b_prev_open and
-                abs(b_prev_close - b_prev_open) / (b_prev_high - b_prev_low) >= 0.7 and
-                abs(prev_close - prev_open) / (prev_high - prev_low) < 0.1 and
+                abs(b_prev_close - b_prev_open) / (b_prev_high - b_prev_low) >= self.min_body_ratio and
+                abs(prev_close - prev_open) / (prev_high - prev_low) < self.max_body_ratio and
                 close > open and
-                abs(close - open) / (high - low) >= 0.7 and
+                abs(close - open) / (high - low) >= self.min_body_ratio and
                 b_prev_close > prev_close and
                 b_prev_close > prev_open and
                 prev_close < open and
                 prev_open < open and
                 close > b_prev_close
-                and (prev_high - max(prev_close, prev_open)) > (3 * abs(prev_close - prev_open))
-                and (min(prev_close, prev_open) - prev_low) > (3 * abs(prev_close - prev_open)))
+                and (prev_high - max(prev_close, prev_open)) > (self.shadow_multiple * abs(prev_close - prev_open))
+                and (min(prev_close, prev_open) - prev_low) > (self.shadow_multiple * abs(prev_close - prev_open)))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+        b_prev_candle = candles.at(2 * multi_coeff)
+
+        return (b_prev_candle.bearish &
+                (b_prev_candle.body_ratio >= self.min_body_ratio) &
+                (prev_candle.body_ratio < self.max_body_ratio) &
+                candle.bullish &
+                (candle.body_ratio >= self.min_body_ratio) &
+                (b_prev_candle.close > prev_candle.close) &
+                (b_prev_candle.close > prev_candle.open) &
+                (prev_candle.close < candle.open) &
+                (prev_candle.open < candle.open) &
+                (candle.close > b_prev_candle.close) &
+                (prev_candle.upper_shadow > (self.shadow_multiple * prev_candle.body)) &
+                (prev_candle.lower_shadow > (self.shadow_multiple * prev_candle.body)))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the middle body stays below the largest doji body
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 1 - prev_candle.body_ratio / self.max_body_ratio
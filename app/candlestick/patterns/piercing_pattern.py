@@ -1,9 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class PiercingPattern(CandlestickFinder):
+    required_count = 2
+    direction = 'bullish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -30,3 +33,23 @@ class PiercingPattern(CandlestickFinder):
         return (prev_close < prev_open and
                 open < prev_low and
                 prev_open > close > prev_close + ((prev_open - prev_close) / 2))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        close = candle.close
+
+        prev_close = prev_candle.close
+        prev_open = prev_candle.open
+
+        return (prev_candle.bearish &
+                (candle.open < prev_candle.low) &
+                (prev_open > close) & (close > prev_close + ((prev_open - prev_close) / 2)))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the close goes up into the previous body, past its midpoint
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return 2 * (candle.close - prev_candle.close) / prev_candle.body - 1
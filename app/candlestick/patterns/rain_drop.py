@@ -1,9 +1,15 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class RainDrop(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+    required_count = 2
+    direction = 'neutral'
+
+    def __init__(self, target=None, min_prev_body_ratio=0.7, min_body_ratio=0.1, max_body_ratio=0.3):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.min_prev_body_ratio = min_prev_body_ratio
+        self.min_body_ratio = min_body_ratio
+        self.max_body_ratio = max_body_ratio
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -20,7 +26,23 @@ class RainDrop(CandlestickFinder):
         prev_low = prev_candle[self.low_column]
 
         return (prev_close < prev_open and
-                abs(prev_close - prev_open) / (prev_high - prev_low) >= 0.7 and
-                0.3 > abs(close - open) / (high - low) >= 0.1 and
+                abs(prev_close - prev_open) / (prev_high - prev_low) >= self.min_prev_body_ratio and
+                self.max_body_ratio > abs(close - open) / (high - low) >= self.min_body_ratio and
                 prev_close > close and
                 prev_close > open)
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return (prev_candle.bearish &
+                (prev_candle.body_ratio >= self.min_prev_body_ratio) &
+                (self.max_body_ratio > candle.body_ratio) & (candle.body_ratio >= self.min_body_ratio) &
+                (prev_candle.close > candle.close) &
+                (prev_candle.close > candle.open))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # Smaller bodies within the allowed range score higher
+        candle = candles.at(0)
+
+        return (self.max_body_ratio - candle.body_ratio) / (self.max_body_ratio - self.min_body_ratio)
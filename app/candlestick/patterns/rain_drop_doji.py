@@ -1,9 +1,15 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class RainDropDoji(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+    required_count = 2
+    direction = 'bullish'
+
+    def __init__(self, target=None, min_prev_body_ratio=0.7, max_body_ratio=0.1, shadow_multiple=3):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.min_prev_body_ratio = min_prev_body_ratio
+        self.max_body_ratio = max_body_ratio
+        self.shadow_multiple = shadow_multiple
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -20,9 +26,27 @@ class RainDropDoji(CandlestickFinder):
         prev_low = prev_candle[self.low_column]
 
         return (prev_close < prev_open and
-                abs(prev_close - prev_open) / (prev_high - prev_low) >= 0.7 and
-                abs(close - open) / (high - low) < 0.1 and
+                abs(prev_close - prev_open) / (prev_high - prev_low) >= self.min_prev_body_ratio and
+                abs(close - open) / (high - low) < self.max_body_ratio and
                 prev_close > close and
                 prev_close > open and
-                (high - max(close, open)) > (3 * abs(close - open)) and
-                (min(close, open) - low) > (3 * abs(close - open)))
+                (high - max(close, open)) > (self.shadow_multiple * abs(close - open)) and
+                (min(close, open) - low) > (self.shadow_multiple * abs(close - open)))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return (prev_candle.bearish &
+                (prev_candle.body_ratio >= self.min_prev_body_ratio) &
+                (candle.body_ratio < self.max_body_ratio) &
+                (prev_candle.close > candle.close) &
+                (prev_candle.close > candle.open) &
+                (candle.upper_shadow > (self.shadow_multiple * candle.body)) &
+                (candle.lower_shadow > (self.shadow_multiple * candle.body)))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How far the body stays below the largest doji body
+        candle = candles.at(0)
+
+        return 1 - candle.body_ratio / self.max_body_ratio
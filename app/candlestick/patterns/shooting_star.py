@@ -1,9 +1,15 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 
 class ShootingStar(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)
+    required_count = 2
+    direction = 'bearish'
+    prior_trend = 'up'
+
+    def __init__(self, target=None, shadow_multiple=3, trend_bars=None, trend_method='return'):
+        super().__init__(self.get_class_name(), self.required_count, target=target,
+                         trend_bars=trend_bars, trend_method=trend_method)
+        self.shadow_multiple = shadow_multiple
 
     def logic(self, idx):
         candle = self.data.iloc[idx]
@@ -20,5 +26,19 @@ class ShootingStar(CandlestickFinder):
         prev_low = prev_candle[self.low_column]
 
         return (prev_open < prev_close < open and
-                high - max(open, close) >= abs(open - close) * 3 and
+                high - max(open, close) >= abs(open - close) * self.shadow_multiple and
                 min(close, open) - low <= abs(open - close))
+
+    def vectorized_logic(self, candles, multi_coeff):
+        candle = candles.at(0)
+        prev_candle = candles.at(1 * multi_coeff)
+
+        return (prev_candle.bullish & (prev_candle.close < candle.open) &
+                (candle.upper_shadow >= candle.body * self.shadow_multiple) &
+                (candle.lower_shadow <= candle.body))
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How much longer the upper shadow is than the body requires
+        candle = candles.at(0)
+
+        return 1 - self.shadow_multiple * candle.body / candle.upper_shadow
@@ -1,8 +1,11 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 class ThreeBlackCrows(CandlestickFinder):
+    required_count = 3  # We need 3 candles to identify the pattern
+    direction = 'bearish'
+
     def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 3, target=target)  # We need 3 candles to identify the pattern
+        super().__init__(self.get_class_name(), self.required_count, target=target)
 
     def logic(self, idx):
         first_candle = self.data.iloc[idx - 2]
@@ -21,3 +24,23 @@ class ThreeBlackCrows(CandlestickFinder):
                    third_candle[self.close_column] < second_candle[self.close_column]:
                     return True
         return False
+
+    def vectorized_logic(self, candles, multi_coeff):
+        first_candle = candles.at(-2)
+        second_candle = candles.at(-1)
+        third_candle = candles.at(0)
+
+        # Check all three candles are bearish
+        direction = first_candle.bearish & second_candle.bearish & third_candle.bearish
+        # Check each candle opens within the body of the previous candle
+        opens = ((second_candle.open < first_candle.open) &
+                 (third_candle.open < second_candle.open))
+        # Check each candle closes lower than the previous candle
+        closes = ((second_candle.close < first_candle.close) &
+                  (third_candle.close < second_candle.close))
+
+        return direction & opens & closes
+
+    def vectorized_score(self, candles, multi_coeff):
+        # Fuller bodies make the three candles a stronger move
+        return (candles.at(-2).body_ratio + candles.at(-1).body_ratio + candles.at(0).body_ratio) / 3
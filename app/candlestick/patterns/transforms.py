@@ -0,0 +1,68 @@
+import numpy as np
+
+names = ('heikin_ashi', 'log', 'zscore')
+
+# Transforms whose closes are already on the scale chart detectors search,
+# instead of in prices to take the logs of
+rescaled = ('log', 'zscore')
+
+# Candles of one block of the Heikin-Ashi open, 2 ** block_size must stay
+# far from the float64 limit
+block_size = 512
+
+
+def halving_recursion(first, values):
+    # x[0] = first and x[t] = (x[t - 1] + values[t - 1]) / 2, as cumulative
+    # sums over blocks: inside a block x[j] = 2 ** -j * cumsum(2 ** i * u[i])
+    # plus what is carried from the end of the previous block. Carries from
+    # two blocks back are weighted 2 ** -block_size, below float64 precision.
+    rows_len = len(values)
+    if rows_len == 0:
+        return np.zeros(0)
+
+    blocks = -(-rows_len // block_size)
+    steps = np.zeros(blocks * block_size)
+    steps[0] = first
+    steps[1:rows_len] = values[:-1] / 2
+    steps = steps.reshape(blocks, block_size)
+
+    scale = np.exp2(np.arange(block_size))
+    local = np.cumsum(steps * scale, axis=1) / scale
+
+    carried = np.concatenate([[0], local[:-1, -1]])
+    result = local + carried[:, np.newaxis] / (2 * scale)
+
+    return result.ravel()[:rows_len]
+
+
+def heikin_ashi(open, high, low, close):
+    ha_close = (open + high + low + close) / 4
+    ha_open = halving_recursion((open[0] + close[0]) / 2 if len(close) else 0, ha_close)
+
+    return (ha_open,
+            np.maximum(high, np.maximum(ha_open, ha_close)),
+            np.minimum(low, np.minimum(ha_open, ha_close)),
+            ha_close)
+
+
+def zscore(open, high, low, close):
+    # Every price is scaled by the mean and deviation of the closes, so the
+    # candles keep their shape
+    mean = np.nanmean(close)
+    std = np.nanstd(close)
+
+    return tuple((values - mean) / std for values in (open, high, low, close))
+
+
+def apply(name, candles):
+    if name == 'heikin_ashi':
+        return heikin_ashi(candles.open, candles.high, candles.low, candles.close)
+
+    if name == 'log':
+        # Already kept with the candles, so nothing is computed twice
+        return candles.log_open, candles.log_high, candles.log_low, candles.log_close
+
+    if name == 'zscore':
+        return zscore(candles.open, candles.high, candles.low, candles.close)
+
+    raise Exception('Transform must be one of ' + ', '.join(names))
@@ -1,8 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 class TweezerBottoms(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)  # This pattern needs 2 candles
+    required_count = 2  # This pattern needs 2 candles
+    direction = 'bullish'
+
+    def __init__(self, target=None, tolerance=0.005):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.tolerance = tolerance
 
     def logic(self, idx):
         if idx < 1:
@@ -12,7 +16,7 @@ class TweezerBottoms(CandlestickFinder):
         second_candle = self.data.iloc[idx]
 
         # Check if both candles have similar lows
-        if abs(first_candle[self.low_column] - second_candle[self.low_column]) <= (first_candle[self.low_column] * 0.005):  # Allows for a small variance
+        if abs(first_candle[self.low_column] - second_candle[self.low_column]) <= (first_candle[self.low_column] * self.tolerance):  # Allows for a small variance
             # Check if the first candle is bearish and the second candle is bullish
             if first_candle[self.close_column] < first_candle[self.open_column] and \
                second_candle[self.close_column] > second_candle[self.open_column]:
@@ -21,3 +25,25 @@ class TweezerBottoms(CandlestickFinder):
                 if second_candle[self.close_column] > midpoint_first_candle:
                     return True
         return False
+
+    def vectorized_logic(self, candles, multi_coeff):
+        first_candle = candles.at(-1)
+        second_candle = candles.at(0)
+
+        # Check if both candles have similar lows
+        similar = abs(first_candle.low - second_candle.low) <= (first_candle.low * self.tolerance)
+        # Check if the first candle is bearish and the second candle is bullish
+        reversal = first_candle.bearish & second_candle.bullish
+        # Check if the second candle closes above the midpoint of the first candle's body
+        midpoint_first_candle = (first_candle.close + first_candle.open) / 2
+        confirmed = second_candle.close > midpoint_first_candle
+
+        # Ensure there are at least two candles before this point
+        return (candles.positions >= 1) & similar & reversal & confirmed
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How close the two lows are within the tolerance
+        first_candle = candles.at(-1)
+        second_candle = candles.at(0)
+
+        return 1 - abs(first_candle.low - second_candle.low) / (first_candle.low * self.tolerance)
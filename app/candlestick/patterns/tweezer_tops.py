@@ -1,8 +1,12 @@
-from candlestick.patterns.candlestick_finder import CandlestickFinder
+from .candlestick_finder import CandlestickFinder
 
 class TweezerTops(CandlestickFinder):
-    def __init__(self, target=None):
-        super().__init__(self.get_class_name(), 2, target=target)  # This pattern needs 2 candles
+    required_count = 2  # This pattern needs 2 candles
+    direction = 'bearish'
+
+    def __init__(self, target=None, tolerance=0.005):
+        super().__init__(self.get_class_name(), self.required_count, target=target)
+        self.tolerance = tolerance
 
     def logic(self, idx):
         if idx < 1:
@@ -12,7 +16,7 @@ class TweezerTops(CandlestickFinder):
         second_candle = self.data.iloc[idx]
 
         # Check if both candles have similar highs
-        if abs(first_candle[self.high_column] - second_candle[self.high_column]) <= (first_candle[self.high_column] * 0.005):  # Allows for a small variance
+        if abs(first_candle[self.high_column] - second_candle[self.high_column]) <= (first_candle[self.high_column] * self.tolerance):  # Allows for a small variance
             # Check if the first candle is bullish and the second candle is bearish
             if first_candle[self.close_column] > first_candle[self.open_column] and \
                second_candle[self.close_column] < second_candle[self.open_column]:
@@ -21,3 +25,25 @@ class TweezerTops(CandlestickFinder):
                 if second_candle[self.close_column] < midpoint_first_candle:
                     return True
         return False
+
+    def vectorized_logic(self, candles, multi_coeff):
+        first_candle = candles.at(-1)
+        second_candle = candles.at(0)
+
+        # Check if both candles have similar highs
+        similar = abs(first_candle.high - second_candle.high) <= (first_candle.high * self.tolerance)
+        # Check if the first candle is bullish and the second candle is bearish
+        reversal = first_candle.bullish & second_candle.bearish
+        # Check if the second candle closes below the midpoint of the first candle's body
+        midpoint_first_candle = (first_candle.close + first_candle.open) / 2
+        confirmed = second_candle.close < midpoint_first_candle
+
+        # Ensure there are at least two candles before this point
+        return (candles.positions >= 1) & similar & reversal & confirmed
+
+    def vectorized_score(self, candles, multi_coeff):
+        # How close the two highs are within the tolerance
+        first_candle = candles.at(-1)
+        second_candle = candles.at(0)
+
+        return 1 - abs(first_candle.high - second_candle.high) / (first_candle.high * self.tolerance)
@@ -0,0 +1,88 @@
+import threading
+
+from .patterns.bearish_engulfing import BearishEngulfing
+from .patterns.bearish_harami import BearishHarami
+from .patterns.bearish_three_method_formation import BearishThreeMethodFormation
+from .patterns.bullish_engulfing import BullishEngulfing
+from .patterns.bullish_harami import BullishHarami
+from .patterns.bullish_three_method_formation import BullishThreeMethodFormation
+from .patterns.dark_cloud_cover import DarkCloudCover
+from .patterns.doji import Doji
+from .patterns.doji_star import DojiStar
+from .patterns.dragonfly_doji import DragonflyDoji
+from .patterns.evening_star import EveningStar
+from .patterns.evening_star_doji import EveningStarDoji
+from .patterns.gravestone_doji import GravestoneDoji
+from .patterns.hammer import Hammer
+from .patterns.hanging_man import HangingMan
+from .patterns.inverted_hammer import InvertedHammer
+from .patterns.morning_star import MorningStar
+from .patterns.morning_star_doji import MorningStarDoji
+from .patterns.piercing_pattern import PiercingPattern
+from .patterns.rain_drop import RainDrop
+from .patterns.rain_drop_doji import RainDropDoji
+from .patterns.shooting_star import ShootingStar
+from .patterns.star import Star
+from .patterns.three_black_crows import ThreeBlackCrows
+from .patterns.three_white_soldiers import ThreeWhiteSoldiers
+from .patterns.tweezer_bottoms import TweezerBottoms
+from .patterns.tweezer_tops import TweezerTops
+
+__patterns = dict()
+__instances = dict()
+__lock = threading.Lock()
+
+
+def register(pattern_class):
+    __patterns[pattern_class.__name__] = pattern_class
+    return pattern_class
+
+
+def is_registered(class_name):
+    return class_name in __patterns
+
+
+def pattern_names():
+    return list(__patterns)
+
+
+def get_pattern_class(class_name):
+    if class_name not in __patterns:
+        raise Exception('{0} is not a registered candlestick pattern'.format(class_name))
+
+    return __patterns[class_name]
+
+
+def get_pattern(class_name, target=None):
+    # Finders keep no state while detecting, the row by row check working on
+    # a copy of the finder, so one instance per target is shared by every
+    # caller and thread instead of building a new one per call
+    key = (class_name, target)
+
+    if key not in __instances:
+        pattern_class = get_pattern_class(class_name)
+
+        with __lock:
+            if key not in __instances:
+                __instances[key] = pattern_class(target=target)
+
+    return __instances[key]
+
+
+def pattern_info(class_name):
+    pattern_class = get_pattern_class(class_name)
+
+    return {'name': class_name,
+            'required_count': pattern_class.required_count,
+            'lookback': pattern_class.required_count - 1,
+            'direction': pattern_class.direction}
+
+
+for __pattern_class in [BearishEngulfing, BearishHarami, BearishThreeMethodFormation,
+                        BullishEngulfing, BullishHarami, BullishThreeMethodFormation,
+                        DarkCloudCover, Doji, DojiStar, DragonflyDoji, EveningStar,
+                        EveningStarDoji, GravestoneDoji, Hammer, HangingMan,
+                        InvertedHammer, MorningStar, MorningStarDoji, PiercingPattern,
+                        RainDrop, RainDropDoji, ShootingStar, Star, ThreeBlackCrows,
+                        ThreeWhiteSoldiers, TweezerBottoms, TweezerTops]:
+    register(__pattern_class)
@@ -0,0 +1,101 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import registry
+from .patterns.candle_features import CandleFeatures
+
+default_horizons = (1, 3, 6, 12, 24)
+
+
+def forward_returns(log_close, horizons=default_horizons):
+    # Log return from each candle's close to the close `horizon` candles
+    # later, NaN where the history ends before the horizon
+    rows_len = len(log_close)
+    returns = np.full((rows_len, len(horizons)), np.nan)
+
+    for col_idx, horizon in enumerate(horizons):
+        if horizon < rows_len:
+            returns[:rows_len - horizon, col_idx] = log_close[horizon:] - log_close[:rows_len - horizon]
+
+    return returns
+
+
+def direction_sign(direction):
+    # Bearish signals profit when the price falls
+    return -1 if direction == 'bearish' else 1
+
+
+def event_paths(log_close, positions, horizon):
+    # Row k holds the log closes from event k up to `horizon` candles after
+    # it, padded with NaN past the end of the history
+    padded = np.concatenate([log_close, np.full(horizon, np.nan)])
+    windows = sliding_window_view(padded, horizon + 1)
+
+    return windows[positions]
+
+
+def pattern_returns(signals,
+                    candles_df=None,
+                    patterns=None,
+                    close_column='close',
+                    horizons=default_horizons):
+    if isinstance(signals, pd.Series):
+        signals = signals.to_frame()
+
+    if not isinstance(signals, pd.DataFrame):
+        raise Exception('Signals must be in Panda data frame type')
+
+    # Output of the pattern helpers already carries the candles
+    if candles_df is None:
+        candles_df = signals
+
+    if close_column not in candles_df.columns:
+        raise Exception('Provided columns does not exist in given data frame')
+
+    if len(candles_df) != len(signals):
+        raise Exception('Signals and candles must have the same length')
+
+    if patterns is None:
+        patterns = [column for column in signals.columns if registry.is_registered(column)]
+
+    horizons = list(horizons)
+    log_close = np.log(CandleFeatures.to_array(candles_df[close_column]))
+    rows = []
+
+    for pattern in patterns:
+        direction = registry.pattern_info(pattern)['direction'] if registry.is_registered(pattern) else 'neutral'
+
+        # Helper output holds None for rows without enough candles around them
+        positions = np.flatnonzero((signals[pattern] == True).to_numpy(dtype=bool))  # noqa: E712
+        paths = event_paths(log_close, positions, max(horizons))
+        excursions = (paths[:, 1:] - paths[:, :1]) * direction_sign(direction)
+        adverse = np.minimum.accumulate(np.minimum(excursions, 0), axis=1)
+
+        row = {'pattern': pattern, 'direction': direction, 'events': len(positions)}
+
+        # Patterns without events, or horizons past the end, give NaN stats
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+
+            for horizon in horizons:
+                returns = excursions[:, horizon - 1]
+                known = ~np.isnan(returns)
+
+                row['hit_rate_{0}'.format(horizon)] = (returns[known] > 0).mean() if known.any() else np.nan
+                row['mean_return_{0}'.format(horizon)] = np.nanmean(returns)
+                row['median_return_{0}'.format(horizon)] = np.nanmedian(returns)
+                row['mae_{0}'.format(horizon)] = -np.nanmean(adverse[:, horizon - 1])
+
+        rows.append(row)
+
+    columns = ['pattern', 'direction', 'events']
+    for horizon in horizons:
+        columns += ['hit_rate_{0}'.format(horizon),
+                    'mean_return_{0}'.format(horizon),
+                    'median_return_{0}'.format(horizon),
+                    'mae_{0}'.format(horizon)]
+
+    return pd.DataFrame(rows, columns=columns).set_index('pattern')
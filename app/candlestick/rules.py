@@ -0,0 +1,264 @@
+import numpy as np
+import pandas as pd
+
+from . import registry
+from .patterns.candle_array import CandleArray
+from .patterns.candle_features import CandleFeatures
+
+__default_ohlc = ['open', 'high', 'low', 'close']
+
+
+class Expression(object):
+    # Expressions are compared by structure: two rules spelling out the same
+    # sub expression share its key, so a batch computes it only once
+    def __init__(self, key):
+        self.key = key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    def __repr__(self):
+        return '{0}{1}'.format(self.__class__.__name__, self.key)
+
+    def compute(self, evaluator):
+        raise Exception('Implement the computation of ' + self.__class__.__name__)
+
+    def __and__(self, other):
+        return Operation('and', self, other)
+
+    def __or__(self, other):
+        return Operation('or', self, other)
+
+    def __invert__(self):
+        return Operation('not', self)
+
+    def __add__(self, other):
+        return Operation('add', self, other)
+
+    def __sub__(self, other):
+        return Operation('sub', self, other)
+
+    def __mul__(self, other):
+        return Operation('mul', self, other)
+
+    def __truediv__(self, other):
+        return Operation('div', self, other)
+
+    def __gt__(self, other):
+        return Operation('gt', self, other)
+
+    def __ge__(self, other):
+        return Operation('ge', self, other)
+
+    def __lt__(self, other):
+        return Operation('lt', self, other)
+
+    def __le__(self, other):
+        return Operation('le', self, other)
+
+    def __eq__(self, other):
+        return Operation('eq', self, other)
+
+    def __ne__(self, other):
+        return Operation('ne', self, other)
+
+    def shift(self, bars):
+        return Shift(self, bars)
+
+    def sma(self, bars):
+        return Rolling('mean', self, bars)
+
+    def rolling_max(self, bars):
+        return Rolling('max', self, bars)
+
+    def rolling_min(self, bars):
+        return Rolling('min', self, bars)
+
+    def any(self, bars):
+        return Rolling('any', self, bars)
+
+    def all(self, bars):
+        return Rolling('all', self, bars)
+
+
+def as_expression(value):
+    if isinstance(value, Expression):
+        return value
+
+    return Constant(value)
+
+
+class Constant(Expression):
+    def __init__(self, value):
+        super().__init__(('constant', float(value)))
+        self.value = float(value)
+
+    def compute(self, evaluator):
+        return self.value
+
+
+class Column(Expression):
+    def __init__(self, name):
+        super().__init__(('column', name))
+        self.name = name
+
+    def compute(self, evaluator):
+        # Prices and any per candle feature, like body or upper_shadow
+        if not hasattr(evaluator.candles, self.name):
+            raise Exception('Unknown candle column {0}'.format(self.name))
+
+        return getattr(evaluator.candles, self.name)
+
+
+class Pattern(Expression):
+    def __init__(self, name):
+        if not registry.is_registered(name):
+            raise Exception('{0} is not a registered candlestick pattern'.format(name))
+
+        super().__init__(('pattern', name))
+        self.name = name
+
+    def compute(self, evaluator):
+        return registry.get_pattern(self.name).detect(evaluator.candles, False)
+
+
+class Operation(Expression):
+    functions = {'and': np.logical_and,
+                 'or': np.logical_or,
+                 'not': np.logical_not,
+                 'add': np.add,
+                 'sub': np.subtract,
+                 'mul': np.multiply,
+                 'div': np.divide,
+                 'gt': np.greater,
+                 'ge': np.greater_equal,
+                 'lt': np.less,
+                 'le': np.less_equal,
+                 'eq': np.equal,
+                 'ne': np.not_equal}
+    commutative = ('and', 'or', 'add', 'mul', 'eq', 'ne')
+
+    def __init__(self, operator, *operands):
+        operands = [as_expression(operand) for operand in operands]
+
+        # a & b and b & a are the same sub expression
+        if operator in self.commutative:
+            operands = sorted(operands, key=lambda operand: repr(operand.key))
+
+        super().__init__(('operation', operator) + tuple(operand.key for operand in operands))
+        self.operator = operator
+        self.operands = operands
+
+    def compute(self, evaluator):
+        return self.functions[self.operator](*[evaluator.value(operand) for operand in self.operands])
+
+
+class Shift(Expression):
+    def __init__(self, operand, bars):
+        if bars < 0:
+            raise Exception('Rules can not look at future candles')
+
+        operand = as_expression(operand)
+        super().__init__(('shift', operand.key, int(bars)))
+        self.operand = operand
+        self.bars = int(bars)
+
+    def compute(self, evaluator):
+        # Value of the candle `bars` candles earlier, missing before the first
+        values = np.asarray(evaluator.value(self.operand))
+        if self.bars == 0:
+            return values
+
+        shifted = np.full(values.shape, False if values.dtype == bool else np.nan,
+                          dtype=bool if values.dtype == bool else np.float64)
+        shifted[self.bars:] = values[:-self.bars]
+        return shifted
+
+
+class Rolling(Expression):
+    def __init__(self, statistic, operand, bars):
+        if bars < 1:
+            raise Exception('Rolling windows need at least one candle')
+
+        operand = as_expression(operand)
+        super().__init__(('rolling', statistic, operand.key, int(bars)))
+        self.statistic = statistic
+        self.operand = operand
+        self.bars = int(bars)
+
+    def compute(self, evaluator):
+        values = np.asarray(evaluator.value(self.operand))
+
+        # any / all count hits over the (possibly shorter) window so far
+        if self.statistic in ('any', 'all'):
+            totals = np.concatenate([[0], np.cumsum(values.astype(bool), dtype=np.int64)])
+            counts = totals[1:] - totals[np.maximum(np.arange(1, len(values) + 1) - self.bars, 0)]
+
+            if self.statistic == 'any':
+                return counts > 0
+
+            return counts == np.minimum(np.arange(1, len(values) + 1), self.bars)
+
+        # Mean, max and min need a full window and are NaN before it
+        result = np.full(len(values), np.nan)
+        if len(values) < self.bars:
+            return result
+
+        if self.statistic == 'mean':
+            totals = np.concatenate([[0], np.cumsum(values, dtype=np.float64)])
+            result[self.bars - 1:] = (totals[self.bars:] - totals[:-self.bars]) / self.bars
+        else:
+            windows = np.lib.stride_tricks.sliding_window_view(values, self.bars)
+            result[self.bars - 1:] = windows.max(axis=1) if self.statistic == 'max' else windows.min(axis=1)
+
+        return result
+
+
+class Evaluator(object):
+    def __init__(self, candles):
+        self.candles = candles
+        self.values = {}
+        self.computed = 0
+
+    def value(self, expression):
+        expression = as_expression(expression)
+
+        if expression.key not in self.values:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.values[expression.key] = expression.compute(self)
+            self.computed += 1
+
+        return self.values[expression.key]
+
+
+def pattern(name):
+    return Pattern(name)
+
+
+def column(name):
+    return Column(name)
+
+
+def evaluate(rules, candles_df, ohlc=__default_ohlc):
+    if isinstance(rules, Expression):
+        rules = {'rule': rules}
+
+    if isinstance(candles_df, CandleArray):
+        candles = CandleFeatures.from_array(candles_df)
+    elif isinstance(candles_df, pd.DataFrame):
+        if not set(ohlc).issubset(candles_df.columns):
+            raise Exception('Provided columns does not exist in given data frame')
+
+        candles = CandleFeatures.from_frame(candles_df, *ohlc)
+    else:
+        raise Exception('Candles must be in Panda data frame type')
+
+    # One evaluator for the whole batch, so every column, pattern, shift and
+    # window used by several rules is computed a single time
+    evaluator = Evaluator(candles)
+
+    results = np.zeros((len(candles), len(rules)), dtype=bool)
+    for col_idx, rule in enumerate(rules.values()):
+        results[:, col_idx] = evaluator.value(rule)
+
+    return pd.DataFrame(results, index=candles_df.index, columns=list(rules))
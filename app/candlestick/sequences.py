@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from . import bitmask, registry
+from .patterns.candle_features import CandleFeatures
+from .returns import default_horizons, direction_sign, forward_returns
+
+
+def flags(signals, patterns=None):
+    # (candles, patterns) matrix out of pattern columns, helper output with
+    # None on unchecked rows included, or out of packed pattern masks
+    if isinstance(signals, pd.DataFrame):
+        if patterns is None:
+            patterns = [column for column in signals.columns if registry.is_registered(column)]
+
+        return (signals[patterns] == True).to_numpy(dtype=bool), list(patterns)  # noqa: E712
+
+    if patterns is None:
+        patterns = registry.pattern_names()
+
+    return bitmask.unpack(signals, patterns).to_numpy(), list(patterns)
+
+
+def recent(found, gap):
+    # Patterns seen on any of the `gap` candles before each candle, from
+    # cumulative counts instead of looking back candle by candle
+    totals = np.concatenate([np.zeros((1, found.shape[1]), dtype=np.int64), np.cumsum(found, axis=0)])
+    ends = np.arange(len(found))
+
+    return totals[ends] - totals[np.maximum(ends - gap, 0)] > 0
+
+
+def sequence_sums(found, log_close, gap, signs, horizons):
+    # Every statistic is a (first, then) matrix: the product of the candles
+    # following `first` with the candles `then` is found on
+    before = recent(found, gap).astype(np.float64)
+    after = found.astype(np.float64)
+    returns = forward_returns(log_close, horizons)
+
+    sums = {'events': before.T @ after}
+    for col_idx, horizon in enumerate(horizons):
+        # Returns from the candle completing the sequence, signed for the
+        # direction of its last pattern
+        signed = returns[:, [col_idx]] * signs
+        known = after * ~np.isnan(signed)
+        signed = np.nan_to_num(signed)
+
+        sums['known_{0}'.format(horizon)] = before.T @ known
+        sums['sum_{0}'.format(horizon)] = before.T @ (known * signed)
+        sums['positive_{0}'.format(horizon)] = before.T @ (known * (signed > 0))
+
+    return sums
+
+
+def pattern_sequences(signals,
+                      candles_df=None,
+                      gap=3,
+                      patterns=None,
+                      close_column='close',
+                      horizons=default_horizons,
+                      min_events=1):
+    # Ordered pairs of patterns, `then` found at most `gap` candles after
+    # `first`, counted once per candle completing them. Signals and candles
+    # of several symbols can be given as dicts keyed by symbol.
+    if gap < 1:
+        raise Exception('Gap must be at least one candle')
+
+    if not isinstance(signals, dict):
+        signals, candles_df = {None: signals}, {None: candles_df}
+    elif candles_df is None:
+        candles_df = {}
+    elif not isinstance(candles_df, dict):
+        raise Exception('Candles must be given for each symbol of the signals')
+
+    horizons = list(horizons)
+    totals = None
+
+    for symbol, symbol_signals in signals.items():
+        found, symbol_patterns = flags(symbol_signals, patterns)
+        if patterns is None:
+            patterns = symbol_patterns
+
+        # Output of the pattern helpers already carries the candles
+        symbol_candles = candles_df.get(symbol)
+        if symbol_candles is None:
+            symbol_candles = symbol_signals
+
+        if not isinstance(symbol_candles, pd.DataFrame) or close_column not in symbol_candles.columns:
+            raise Exception('Provided columns does not exist in given data frame')
+
+        if len(symbol_candles) != len(found):
+            raise Exception('Signals and candles must have the same length')
+
+        log_close = np.log(CandleFeatures.to_array(symbol_candles[close_column]))
+        signs = np.array([direction_sign(registry.pattern_info(pattern)['direction']) for pattern in patterns])
+        sums = sequence_sums(found, log_close, gap, signs, horizons)
+
+        if totals is None:
+            totals = sums
+        else:
+            totals = {name: totals[name] + values for name, values in sums.items()}
+
+    columns = ['first', 'then', 'events']
+    for horizon in horizons:
+        columns += ['hit_rate_{0}'.format(horizon), 'mean_return_{0}'.format(horizon)]
+
+    if totals is None:
+        return pd.DataFrame(columns=columns).set_index(['first', 'then'])
+
+    firsts, thens = np.nonzero(totals['events'] >= max(min_events, 1))
+    table = {'first': [patterns[col_idx] for col_idx in firsts],
+             'then': [patterns[col_idx] for col_idx in thens],
+             'events': totals['events'][firsts, thens].astype(np.int64)}
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for horizon in horizons:
+            known = totals['known_{0}'.format(horizon)][firsts, thens]
+            table['hit_rate_{0}'.format(horizon)] = totals['positive_{0}'.format(horizon)][firsts, thens] / known
+            table['mean_return_{0}'.format(horizon)] = totals['sum_{0}'.format(horizon)][firsts, thens] / known
+
+    result = pd.DataFrame(table, columns=columns)
+    return result.sort_values('events', ascending=False, kind='stable').set_index(['first', 'then'])
@@ -0,0 +1,112 @@
+import numpy as np
+
+from . import registry
+from .patterns.candle_features import CandleFeatures
+
+
+class CandlestickStream(object):
+    def __init__(self, patterns=None):
+        if patterns is None:
+            patterns = registry.pattern_names()
+
+        self.finders = [registry.get_pattern(class_name) for class_name in patterns]
+        self.window = max([finder.required_count for finder in self.finders], default=1)
+        self.count = 0
+
+        # Ring buffer holding only the last `window` closed candles
+        self.open = np.zeros(self.window)
+        self.high = np.zeros(self.window)
+        self.low = np.zeros(self.window)
+        self.close = np.zeros(self.window)
+        self.head = 0
+
+        # Closed candles a forming one is checked with, oldest first, and a
+        # last column the forming candle is written to on every tick
+        self.context = np.zeros((4, self.window))
+        self.context_start = self.window - 1
+        self.forming = None
+
+    def update(self, open, high, low, close):
+        self.open[self.head] = open
+        self.high[self.head] = high
+        self.low[self.head] = low
+        self.close[self.head] = close
+        self.head = (self.head + 1) % self.window
+        self.count += 1
+
+        # The context only changes when a candle closes
+        rows_len = min(self.count, self.window - 1)
+        order = (self.head - rows_len + np.arange(rows_len)) % self.window
+        self.context_start = self.window - 1 - rows_len
+        self.context[:, self.context_start:-1] = [self.open[order],
+                                                  self.high[order],
+                                                  self.low[order],
+                                                  self.close[order]]
+        self.forming = None
+
+        return self.detect(self.candles())
+
+    def tick(self, price):
+        # A trade on the forming candle, opened by its first trade
+        if self.forming is None:
+            self.forming = [price, price, price, price]
+        else:
+            self.forming = [self.forming[0], max(self.forming[1], price), min(self.forming[2], price), price]
+
+        return self.peek(*self.forming)
+
+    def peek(self, open, high, low, close):
+        # Patterns the forming candle would complete if it closed like this.
+        # Closed candles stay as they are and nothing is copied.
+        self.context[:, -1] = open, high, low, close
+        candles = FormingCandles(self.context[:, self.context_start:], self.count)
+        found = []
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for finder in self.finders:
+                if len(candles) >= finder.required_count and finder.vectorized_logic(candles, -1):
+                    found.append(finder.target)
+
+        return found
+
+    def candles(self):
+        # Oldest to newest candles currently held in the ring buffer
+        rows_len = min(self.count, self.window)
+        order = (self.head - rows_len + np.arange(rows_len)) % self.window
+
+        return CandleFeatures(self.open[order],
+                              self.high[order],
+                              self.low[order],
+                              self.close[order])
+
+    def detect(self, candles):
+        found = []
+
+        for finder in self.finders:
+            # Same vectorized rules as has_pattern, evaluated on the few candles
+            # the pattern looks at, keeping only the newest one
+            if len(candles) >= finder.required_count and finder.detect(candles, False)[-1]:
+                found.append(finder.target)
+
+        return found
+
+
+class FormingCandles(object):
+    def __init__(self, context, position):
+        # Closed candles, oldest first, then the forming candle at `position`
+        self.context = context
+        self.positions = position
+        self.__candles = {}
+
+    def __len__(self):
+        return self.context.shape[1]
+
+    def at(self, offset):
+        # Each candle as float scalars, so the vectorized rules work out
+        # only the forming candle instead of whole shifted columns
+        if offset not in self.__candles:
+            candle = CandleFeatures(*self.context[:, offset - 1])
+            candle.positions = self.positions + offset
+            self.__candles[offset] = candle
+
+        return self.__candles[offset]
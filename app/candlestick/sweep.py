@@ -0,0 +1,65 @@
+import inspect
+
+import numpy as np
+import pandas as pd
+
+from . import registry
+from .patterns.candle_features import CandleFeatures
+from .returns import default_horizons, direction_sign, forward_returns
+
+__default_ohlc = ['open', 'high', 'low', 'close']
+
+
+def thresholds(pattern):
+    # The trend gate is a context setting, not a threshold of the pattern
+    pattern_class = registry.get_pattern_class(pattern)
+
+    return {name: parameter.default
+            for name, parameter in inspect.signature(pattern_class).parameters.items()
+            if name != 'target' and not name.startswith('trend_')}
+
+
+def sweep(candles_df,
+          pattern,
+          grid,
+          ohlc=__default_ohlc,
+          horizons=default_horizons):
+    if not grid:
+        raise Exception('Provide at least one threshold to sweep')
+
+    defaults = thresholds(pattern)
+    for name in grid:
+        if name not in defaults:
+            raise Exception('{0} has no threshold named {1}'.format(pattern, name))
+
+    # Every combination of the given values is one grid point
+    names = list(grid)
+    mesh = np.meshgrid(*[np.asarray(grid[name], dtype=np.float64) for name in names], indexing='ij')
+    points = {name: values.ravel() for name, values in zip(names, mesh)}
+    points_len = mesh[0].size
+
+    finder = registry.get_pattern_class(pattern)(**points)
+    finder.check_data(candles_df, ohlc)
+
+    # Candles go down the rows and grid points across the columns, so the
+    # whole grid is evaluated by a single broadcast pass of the pattern
+    candles = CandleFeatures.from_frame(candles_df, *ohlc)
+    found = np.broadcast_to(finder.detect(candles.expand(), False), (len(candles), points_len))
+    found = found.astype(np.float64)
+
+    returns = forward_returns(candles.log_close, horizons) * direction_sign(finder.direction)
+    known = ~np.isnan(returns)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        events = found.T @ known
+        mean_returns = (found.T @ np.where(known, returns, 0)) / events
+        hit_rates = (found.T @ (returns > 0)) / events
+
+    summary = pd.DataFrame(points)
+    summary['hits'] = found.sum(axis=0).astype(np.int64)
+
+    for col_idx, horizon in enumerate(horizons):
+        summary['mean_return_{0}'.format(horizon)] = mean_returns[:, col_idx]
+        summary['hit_rate_{0}'.format(horizon)] = hit_rates[:, col_idx]
+
+    return summary
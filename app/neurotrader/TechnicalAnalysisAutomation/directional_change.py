@@ -3,57 +3,101 @@ import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
 
-def directional_change(close: np.array, high: np.array, low: np.array, sigma: float):
-    
-    up_zig = True # Last extreme is a bottom. Next is a top. 
-    tmp_max = high[0]
-    tmp_min = low[0]
-    tmp_max_i = 0
-    tmp_min_i = 0
-
-    tops = []
-    bottoms = []
-
-    for i in range(len(close)):
-        if up_zig: # Last extreme is a bottom
-            if high[i] > tmp_max:
+class DirectionalChange:
+
+    def __init__(self, sigma: float):
+        self.sigma = sigma
+        self.up_zig = True # Last extreme is a bottom. Next is a top. 
+        self.tmp_max = None
+        self.tmp_min = None
+        self.tmp_max_i = 0
+        self.tmp_min_i = 0
+        self.trigger = None # Close confirming the pending extreme
+        self.i = -1 # Index of the last bar seen
+
+        self.tops = []
+        self.bottoms = []
+
+    def update(self, high: float, low: float, close: float):
+        # Feed one new bar. Returns (1, top) or (-1, bottom) when this bar
+        # confirms an extreme, None otherwise
+        self.i += 1
+        i = self.i
+
+        if i == 0:
+            self.tmp_max = high
+            self.tmp_min = low
+            self.trigger = high - high * self.sigma
+
+        if self.up_zig: # Last extreme is a bottom
+            if high > self.tmp_max:
                 # New high, update 
-                tmp_max = high[i]
-                tmp_max_i = i
-            elif close[i] < tmp_max - tmp_max * sigma: 
+                self.tmp_max = high
+                self.tmp_max_i = i
+                self.trigger = high - high * self.sigma
+            elif close < self.trigger: 
                 # Price retraced by sigma %. Top confirmed, record it
                 # top[0] = confirmation index
                 # top[1] = index of top
                 # top[2] = price of top
-                top = [i, tmp_max_i, tmp_max]
-                tops.append(top)
+                top = [i, self.tmp_max_i, self.tmp_max]
+                self.tops.append(top)
 
                 # Setup for next bottom
-                up_zig = False
-                tmp_min = low[i]
-                tmp_min_i = i
+                self.up_zig = False
+                self.tmp_min = low
+                self.tmp_min_i = i
+                self.trigger = low + low * self.sigma
+                return 1, top
         else: # Last extreme is a top
-            if low[i] < tmp_min:
+            if low < self.tmp_min:
                 # New low, update 
-                tmp_min = low[i]
-                tmp_min_i = i
-            elif close[i] > tmp_min + tmp_min * sigma: 
+                self.tmp_min = low
+                self.tmp_min_i = i
+                self.trigger = low + low * self.sigma
+            elif close > self.trigger: 
                 # Price retraced by sigma %. Bottom confirmed, record it
                 # bottom[0] = confirmation index
                 # bottom[1] = index of bottom
                 # bottom[2] = price of bottom
-                bottom = [i, tmp_min_i, tmp_min]
-                bottoms.append(bottom)
+                bottom = [i, self.tmp_min_i, self.tmp_min]
+                self.bottoms.append(bottom)
 
                 # Setup for next top
-                up_zig = True
-                tmp_max = high[i]
-                tmp_max_i = i
+                self.up_zig = True
+                self.tmp_max = high
+                self.tmp_max_i = i
+                self.trigger = high - high * self.sigma
+                return -1, bottom
 
-    return tops, bottoms
+        return None
 
-def get_extremes(ohlc: pd.DataFrame, sigma: float):
-    tops, bottoms = directional_change(ohlc['close'], ohlc['high'], ohlc['low'], sigma)
+def directional_change(close: np.array, high: np.array = None, low: np.array = None, sigma: float = None):
+    # Candles holding their own columns, like a CandleArray, can be passed alone
+    if high is None and low is None:
+        close, high, low = close.close, close.high, close.low
+
+    # Plain floats, so no Series is indexed element by element
+    dc = DirectionalChange(sigma)
+    for h, l, c in zip(np.asarray(high).tolist(), np.asarray(low).tolist(), np.asarray(close).tolist()):
+        dc.update(h, l, c)
+
+    return dc.tops, dc.bottoms
+
+def directional_change_multi(close: np.array, high: np.array = None, low: np.array = None, sigmas: list = None):
+    # Same extremes as directional_change for each sigma, with one state
+    # machine per sigma stepped in lockstep over a single pass of the bars
+    if high is None and low is None:
+        close, high, low = close.close, close.high, close.low
+
+    machines = [DirectionalChange(sigma) for sigma in sigmas]
+    for h, l, c in zip(np.asarray(high).tolist(), np.asarray(low).tolist(), np.asarray(close).tolist()):
+        for dc in machines:
+            dc.update(h, l, c)
+
+    return [(dc.tops, dc.bottoms) for dc in machines]
+
+def extremes_frame(tops: list, bottoms: list):
     tops = pd.DataFrame(tops, columns=['conf_i', 'ext_i', 'ext_p'])
     bottoms = pd.DataFrame(bottoms, columns=['conf_i', 'ext_i', 'ext_p'])
     tops['type'] = 1
@@ -63,6 +107,19 @@ def get_extremes(ohlc: pd.DataFrame, sigma: float):
     extremes = extremes.sort_index()
     return extremes
 
+def get_extremes(ohlc: pd.DataFrame, sigma: float):
+    tops, bottoms = directional_change(ohlc['close'], ohlc['high'], ohlc['low'], sigma)
+    return extremes_frame(tops, bottoms)
+
+def get_extremes_multi(ohlc: pd.DataFrame, sigmas: list):
+    # One extremes table per sigma, like get_extremes, from a single pass
+    sigmas = list(sigmas)
+    if len(set(sigmas)) != len(sigmas):
+        raise Exception('Sigmas must be unique')
+
+    found = directional_change_multi(ohlc['close'], ohlc['high'], ohlc['low'], sigmas)
+    return {sigma: extremes_frame(tops, bottoms) for sigma, (tops, bottoms) in zip(sigmas, found)}
+
 
 
 
@@ -2,9 +2,10 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
-from neurotrader.TechnicalAnalysisAutomation.perceptually_important import find_pips
-from neurotrader.TechnicalAnalysisAutomation.rolling_window import rw_top, rw_bottom
-from neurotrader.TechnicalAnalysisAutomation.trendline_automation import fit_trendlines_single
+from app.neurotrader.TechnicalAnalysisAutomation.perceptually_important import find_pips
+from app.neurotrader.TechnicalAnalysisAutomation.rolling_window import rw_top, rw_bottom
+from app.neurotrader.TechnicalAnalysisAutomation.trendline_automation import fit_trendlines_single
+from app.candlestick.patterns.candle_array import search_prices
 from dataclasses import dataclass
 
 @dataclass
@@ -195,6 +196,9 @@ def check_bull_pattern_pips(pending: FlagPattern, data: np.array, i:int, order:i
 
 def find_flags_pennants_pips(data: np.array, order:int):
     assert(order >= 3)
+
+    data = search_prices(data)
+
     pending_bull = None # Pending pattern
     pending_bear = None # Pending pattern
 
@@ -332,6 +336,9 @@ def check_bear_pattern_trendline(pending: FlagPattern, data: np.array, i:int, or
 
 def find_flags_pennants_trendline(data: np.array, order:int):
     assert(order >= 3)
+
+    data = search_prices(data)
+
     pending_bull = None # Pending pattern
     pending_bear = None  # Pending pattern
 
@@ -3,7 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
 import scipy
-from directional_change import directional_change, get_extremes
+from directional_change import directional_change, get_extremes, get_extremes_multi
 from dataclasses import dataclass
 from typing import Union
 from math import log
@@ -230,9 +230,8 @@ if __name__ == '__main__':
     data['r'] = np.log(data['close']).diff().shift(-1)
     all_combined = np.zeros(len(data))
     sigmas = [0.01, 0.015, 0.02, 0.025, 0.03, 0.035, 0.04]
-    for sigma in sigmas:
+    for sigma, extremes in get_extremes_multi(data, sigmas).items():
 
-        extremes = get_extremes(data, sigma)
         output =  find_xabcd(data, extremes, 0.5)
         sig = np.zeros(len(data))
         for pat in ALL_PATTERNS:
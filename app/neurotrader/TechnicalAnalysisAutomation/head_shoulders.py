@@ -3,6 +3,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import mplfinance as mpf
 from app.neurotrader.TechnicalAnalysisAutomation.rolling_window import rw_top, rw_bottom
+from app.candlestick.patterns.candle_array import search_prices
 from typing import List
 from collections import deque
 from dataclasses import dataclass
@@ -275,6 +276,8 @@ def check_ihs_pattern(extrema_indices: List[int], data: np.array, i:int, early_f
 
 def find_hs_patterns(data: np.array, order:int, early_find:bool = False):
     assert(order >= 1)
+
+    data = search_prices(data)
     
     # head and shoulders top checked from/after a confirmed bottom (before right shoulder)
     # head and shoulders bottom checked from/after a confirmed top 
@@ -5,7 +5,7 @@ import mplfinance as mpf
 import scipy
 import math
 import pandas_ta as ta
-from directional_change import directional_change, get_extremes
+from directional_change import directional_change, get_extremes, get_extremes_multi
 
 
 data = pd.read_csv('BTCUSDT3600.csv')
@@ -14,8 +14,7 @@ data = data.set_index('date')
 plt.style.use('dark_background') 
 
 
-for sigma in [0.01, 0.02, 0.03, 0.04]:
-    extremes = get_extremes(data, sigma)
+for sigma, extremes in get_extremes_multi(data, [0.01, 0.02, 0.03, 0.04]).items():
 
     # Find segment heights, retracement ratios
     extremes['seg_height'] = (extremes['ext_p'] - extremes['ext_p'].shift(1)).abs()
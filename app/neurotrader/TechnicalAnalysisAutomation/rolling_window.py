@@ -1,6 +1,7 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor
 
 # Checks if there is a local top detected at curr index
 def rw_top(data: np.array, curr_index: int, order: int) -> bool:
@@ -34,6 +35,10 @@ def rw_bottom(data: np.array, curr_index: int, order: int) -> bool:
 
 def rw_extremes(data: np.array, order:int):
     # Rolling window local tops and bottoms
+    # Candles holding their own columns, like a CandleArray, are searched on close
+    if hasattr(data, 'close'):
+        data = data.close
+
     tops = []
     bottoms = []
     for i in range(len(data)):
@@ -53,6 +58,41 @@ def rw_extremes(data: np.array, order:int):
     
     return tops, bottoms
 
+def rw_extremes_chunk(data: np.array, order: int, first_index: int, core_start: int):
+    # Extremes confirmed on the chunk's own candles, with global indices
+    tops, bottoms = rw_extremes(data, order)
+
+    def shift(extremes):
+        return [[conf_i + first_index, ext_i + first_index, price]
+                for conf_i, ext_i, price in extremes if conf_i >= core_start]
+
+    return shift(tops), shift(bottoms)
+
+def rw_extremes_chunked(data: np.array, order: int, chunk_size: int = 1_000_000, processes: int = None):
+    # Same result as rw_extremes, computed on chunks that each carry the
+    # 2 * order + 1 candles before them. rw_top / rw_bottom need that many
+    # earlier candles before confirming anything, so with the halo every
+    # candle of a chunk is checked exactly as in a single pass.
+    if hasattr(data, 'close'):
+        data = data.close
+
+    data = np.asarray(data)
+    halo = order * 2 + 1
+    chunks = []
+    for start in range(0, len(data), chunk_size):
+        before = min(start, halo)
+        chunks.append((data[start - before:start + chunk_size], order, start - before, before))
+
+    if processes is None or processes < 2 or len(chunks) < 2:
+        results = [rw_extremes_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(rw_extremes_chunk, *zip(*chunks)))
+
+    tops = [top for chunk_tops, _ in results for top in chunk_tops]
+    bottoms = [bottom for _, chunk_bottoms in results for bottom in chunk_bottoms]
+    return tops, bottoms
+
 
 
 if __name__ == "__main__":
@@ -22,6 +22,8 @@ class UserCreateRequest(BaseRequest):
 class CandlestickRequest(BaseModel):
     symbol: str
     target: str
-    pattern_type: str  # 'candlestick' or 'chart'
+    pattern_type: str  # 'candlestickPatterns', 'candlestickMask' or 'chart'
     interval: str = "1d"
-    limit: int = 1000
\ No newline at end of file
+    limit: int = 1000
+    last: int | None = None  # only check the last N candles
+    since: int | None = None  # only check candles opened from this epoch ms on
\ No newline at end of file
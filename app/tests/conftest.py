@@ -1,7 +1,9 @@
 import asyncio
 import os
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import AsyncGenerator, Callable, Generator
 
+import numpy as np
+import pandas as pd
 import pytest
 import pytest_asyncio
 import sqlalchemy
@@ -24,6 +26,23 @@ default_user_password = "geralt"
 default_user_access_token = create_jwt_token(default_user_id).access_token
 
 
+def make_candles(rows: int, seed: int = 1) -> pd.DataFrame:
+    # Coarse prices so that ties, dojis and engulfing bodies show up often
+    rng = np.random.default_rng(seed)
+    open_ = 100 + rng.integers(-8, 9, rows).cumsum() * 0.5
+    close = open_ + rng.integers(-8, 9, rows) * 0.5
+    high = np.maximum(open_, close) + rng.integers(0, 9, rows) ** 2 * 0.125
+    low = np.minimum(open_, close) - rng.integers(0, 9, rows) ** 2 * 0.125
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+
+
+def timed_candles(rows: int, seed: int = 1, time_column: str = "time") -> pd.DataFrame:
+    # Hourly candles from 2024-01-01 on, their times in time_column
+    candles_df = make_candles(rows, seed)
+    candles_df[time_column] = pd.date_range("2024-01-01", periods=rows, freq="h")
+    return candles_df
+
+
 @pytest.fixture(scope="session")
 def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
     loop = asyncio.new_event_loop()
@@ -133,3 +152,13 @@ async def fixture_default_user(
 @pytest.fixture(name="default_user_headers", scope="function")
 def fixture_default_user_headers(default_user: User) -> dict[str, str]:
     return {"Authorization": f"Bearer {default_user_access_token}"}
+
+
+@pytest.fixture(name="make_candles", scope="session")
+def fixture_make_candles() -> Callable[..., pd.DataFrame]:
+    return make_candles
+
+
+@pytest.fixture(name="timed_candles", scope="session")
+def fixture_timed_candles() -> Callable[..., pd.DataFrame]:
+    return timed_candles
@@ -0,0 +1,34 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import registry
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+
+@pytest.fixture(name="get_pattern", scope="session")
+def fixture_get_pattern() -> Callable[[str], CandlestickFinder]:
+    # A finder of its own, rather than the registry's shared instance
+    def get_pattern(class_name: str) -> CandlestickFinder:
+        return registry.get_pattern_class(class_name)()
+
+    return get_pattern
+
+
+@pytest.fixture(name="make_panel", scope="session")
+def fixture_make_panel(make_candles: Callable[..., pd.DataFrame]) -> Callable[..., pd.DataFrame]:
+    def make_panel(symbols: list[str], rows: int = 120) -> pd.DataFrame:
+        frames = []
+        for seed, symbol in enumerate(symbols, start=1):
+            candles_df = make_candles(rows + seed * 7, seed=seed)
+            candles_df["symbol"] = symbol
+            candles_df["time"] = np.arange(len(candles_df))
+            frames.append(candles_df)
+
+        # Interleave the symbols so grouping and time ordering are exercised
+        panel_df = pd.concat(frames, ignore_index=True)
+        return panel_df.sample(frac=1, random_state=3)
+
+    return make_panel
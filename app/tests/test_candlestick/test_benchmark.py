@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from app.candlestick import benchmark, registry
+
+ROWS = 500
+
+
+def test_helpers_cover_every_pattern() -> None:
+    assert len(benchmark.helpers()) == len(registry.pattern_names())
+    assert "scan_all" not in benchmark.helpers()
+
+
+def test_helpers_reject_unknown_names() -> None:
+    with pytest.raises(Exception, match="Unknown candlestick helpers: bogus"):
+        benchmark.helpers(["hammer", "bogus"])
+
+
+def test_run_records_time_throughput_and_memory(tmp_path) -> None:
+    datasets = {"synthetic": benchmark.synthetic_candles(ROWS)}
+
+    results = benchmark.run(datasets, ["hammer", "doji"], repeat=1)
+
+    assert [(result["helper"], result["is_reversed"]) for result in results] == [
+        ("hammer", False), ("doji", False), ("scan_all", False),
+        ("hammer", True), ("doji", True), ("scan_all", True),
+    ]
+    for result in results:
+        assert result["candles"] == ROWS
+        assert result["wall_time"] > 0
+        assert result["candles_per_second"] == pytest.approx(ROWS / result["wall_time"])
+        assert result["peak_memory"] > 0
+
+    path = tmp_path / "results.json"
+    benchmark.write(results, path)
+    assert json.loads(path.read_text())["results"] == results
+
+
+def test_compare_reports_wall_time_ratio(tmp_path) -> None:
+    results = benchmark.run({"synthetic": benchmark.synthetic_candles(200)}, ["doji"], modes=(False,), repeat=1)
+    benchmark.write(results, tmp_path / "baseline.json")
+    slower = [dict(result, wall_time=result["wall_time"] * 2) for result in results]
+    benchmark.write(slower, tmp_path / "current.json")
+
+    comparison = benchmark.compare(tmp_path / "baseline.json", tmp_path / "current.json")
+
+    assert comparison["helper"].tolist() == ["doji", "scan_all"]
+    assert comparison["ratio"].tolist() == pytest.approx([2, 2])
@@ -0,0 +1,95 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import bitmask, candlestick, registry
+
+
+def test_every_pattern_has_its_own_bit() -> None:
+    bits = bitmask.bit_positions()
+
+    assert list(bits) == registry.pattern_names()
+    assert sorted(bits.values()) == list(range(len(bits)))
+    assert bitmask.pattern_mask("Doji") == 1 << bits["Doji"]
+
+
+def test_scan_all_mask_matches_frame(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(400, seed=3)
+
+    masks = candlestick.scan_all(candles_df, output="mask")
+    found = candlestick.scan_all(candles_df)
+
+    assert masks.dtype == np.uint32
+    assert masks.index.equals(candles_df.index)
+    assert np.array_equal(bitmask.pack(found), masks.to_numpy())
+    assert bitmask.unpack(masks, index=candles_df.index).equals(found)
+
+
+def test_pack_uses_registry_bits_for_any_columns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(200, seed=3)
+    found = candlestick.scan_all(candles_df, patterns=["TweezerTops", "Doji"])
+
+    masks = bitmask.pack(found)
+
+    assert np.array_equal(bitmask.has_any(masks, bitmask.pattern_mask("Doji")), found["Doji"].to_numpy())
+    assert np.array_equal(masks, candlestick.scan_all(candles_df, patterns=["Doji", "TweezerTops"], output="mask"))
+
+
+def test_queries_match_flag_columns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(400, seed=3)
+    found = candlestick.scan_all(candles_df)
+    masks = bitmask.pack(found)
+
+    bearish = [name for name in found.columns if registry.get_pattern_class(name).direction == "bearish"]
+    assert np.array_equal(bitmask.has_any(masks, bitmask.direction_mask("bearish")), found[bearish].any(axis=1))
+
+    both = bitmask.pattern_mask("Doji", "Hammer")
+    assert np.array_equal(bitmask.has_all(masks, both), found["Doji"] & found["Hammer"])
+
+    assert np.array_equal(bitmask.count(masks), found.sum(axis=1))
+
+
+def test_count_of_full_masks() -> None:
+    masks = np.array([0, 1, 0xFFFFFFFF, 0x80000001], dtype=np.uint32)
+
+    assert bitmask.count(masks).tolist() == [0, 1, 32, 2]
+
+
+def test_bytes_round_trip() -> None:
+    masks = np.array([0, 5, 1 << 26], dtype=np.uint32)
+
+    data = bitmask.to_bytes(masks)
+
+    assert len(data) == masks.nbytes
+    assert np.array_equal(bitmask.from_bytes(data), masks)
+
+
+def test_save_and_load(make_candles: Callable[..., pd.DataFrame], tmp_path) -> None:
+    masks = candlestick.scan_all(make_candles(100), output="mask")
+    times = np.arange(len(masks), dtype=np.int64) * 60_000
+    path = tmp_path / "masks.npz"
+
+    bitmask.save(path, masks, times)
+    loaded, loaded_times = bitmask.load(path)
+
+    assert np.array_equal(loaded, masks)
+    assert np.array_equal(loaded_times, times)
+
+
+def test_load_moves_bits_saved_in_another_order(tmp_path) -> None:
+    path = tmp_path / "masks.npz"
+    patterns = list(reversed(registry.pattern_names()))
+    saved = np.array([1 << patterns.index("Doji"), 1 << patterns.index("Hammer")], dtype=np.uint32)
+    np.savez(path, masks=saved, patterns=np.array(patterns))
+
+    loaded, times = bitmask.load(path)
+
+    assert times is None
+    assert loaded.tolist() == [bitmask.pattern_mask("Doji"), bitmask.pattern_mask("Hammer")]
+
+
+def test_unknown_pattern_mask() -> None:
+    with pytest.raises(Exception):
+        bitmask.pattern_mask("Marubozu")
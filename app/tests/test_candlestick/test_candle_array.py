@@ -0,0 +1,86 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick
+from app.candlestick.patterns.candle_array import CandleArray
+from app.candlestick.patterns.candle_features import CandleFeatures
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def test_from_frame_keeps_numeric_columns_and_epoch_ms(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(50, time_column="date")
+
+    candles = CandleArray.from_frame(candles_df, time_column="date")
+
+    assert len(candles) == len(candles_df)
+    assert candles.time[1] - candles.time[0] == 3600 * 1000
+    assert candles.time[0] == pd.Timestamp("2024-01-01").value // 10**6
+    assert np.array_equal(candles["close"], candles_df["close"].to_numpy())
+    assert not hasattr(candles, "__dict__")
+
+
+def test_float32_prices_use_half_the_memory(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(50, time_column="date")
+
+    wide = CandleArray.from_frame(candles_df)
+    narrow = CandleArray.from_frame(candles_df, dtype=np.float32)
+
+    assert narrow.dtype == np.float32
+    assert narrow.nbytes * 2 == wide.nbytes
+
+
+def test_from_csv_reads_dates(timed_candles: Callable[..., pd.DataFrame], tmp_path) -> None:
+    path = tmp_path / "candles.csv"
+    timed_candles(30, time_column="date").to_csv(path, index=False)
+
+    candles = CandleArray.from_csv(path)
+
+    assert candles.index.equals(pd.DatetimeIndex(timed_candles(30, time_column="date")["date"]))
+    assert np.allclose(candles.open, timed_candles(30, time_column="date")["open"])
+
+
+def test_npy_round_trip_is_memory_mapped(timed_candles: Callable[..., pd.DataFrame], tmp_path) -> None:
+    path = str(tmp_path / "candles.npy")
+    CandleArray.from_frame(timed_candles(40, time_column="date"), time_column="date").save(path)
+
+    candles = CandleArray.load(path)
+    features = CandleFeatures.from_array(candles)
+
+    assert isinstance(candles.close.base, np.memmap) or isinstance(candles.close, np.memmap)
+    assert not candles.close.flags.writeable
+    assert np.shares_memory(features.close, candles.close)
+    assert candles.time[0] == pd.Timestamp("2024-01-01").value // 10**6
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_finders_accept_candle_array(timed_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder], is_reversed: bool) -> None:
+    candles_df = timed_candles(200, time_column="date")
+    candles = CandleArray.from_frame(candles_df, time_column="date")
+    indexed_df = candles_df.set_index("date")
+
+    for class_name in ["Hammer", "MorningStar", "TweezerTops"]:
+        finder = get_pattern(class_name)
+        expected = finder.has_pattern(indexed_df, OHLC, is_reversed)
+
+        assert finder.has_pattern(candles, OHLC, is_reversed).equals(expected)
+        assert finder.has_pattern(candles, OHLC, is_reversed, output="series").equals(
+            finder.has_pattern(indexed_df, OHLC, is_reversed, output="series")
+        )
+        assert finder.has_pattern(candles, OHLC, is_reversed, vectorized=False)[class_name].tolist() == \
+            expected[class_name].tolist()
+
+
+def test_scan_all_accepts_candle_array(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(200)
+
+    assert candlestick.scan_all(CandleArray.from_frame(candles_df)).equals(candlestick.scan_all(candles_df))
+
+
+def test_mismatched_columns_are_rejected() -> None:
+    with pytest.raises(Exception, match="same length"):
+        CandleArray(np.ones(3), np.ones(3), np.ones(2), np.ones(3))
@@ -0,0 +1,91 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.candlestick import registry
+from app.candlestick.patterns.candle_features import CandleFeatures
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def test_from_frame_reuses_features_of_same_data(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(100)
+
+    first = CandleFeatures.from_frame(candles_df, *OHLC)
+    second = CandleFeatures.from_frame(candles_df.copy(), *OHLC)
+
+    assert first is second
+    assert first.body is second.body
+
+
+def test_cached_features_are_not_shared_by_different_data(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(100)
+    features = CandleFeatures.from_frame(candles_df, *OHLC)
+
+    candles_df.loc[5, "close"] += 1
+
+    changed = CandleFeatures.from_frame(candles_df, *OHLC)
+    assert changed is not features
+    assert features.close[5] == changed.close[5] - 1
+
+
+def test_cache_evicts_least_recently_used(make_candles: Callable[..., pd.DataFrame], monkeypatch) -> None:
+    CandleFeatures.clear_cache()
+    frames = [make_candles(20, seed=seed) for seed in range(3)]
+
+    first = CandleFeatures.from_frame(frames[0], *OHLC)
+    monkeypatch.setattr(CandleFeatures, "cache_bytes", 2 * first.nbytes)
+    second = CandleFeatures.from_frame(frames[1], *OHLC)
+    assert CandleFeatures.from_frame(frames[0], *OHLC) is first
+
+    CandleFeatures.from_frame(frames[2], *OHLC)
+    assert CandleFeatures.from_frame(frames[0], *OHLC) is first
+    assert CandleFeatures.from_frame(frames[1], *OHLC) is not second
+    CandleFeatures.clear_cache()
+
+
+def test_derived_columns_count_towards_cache_bytes(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder], monkeypatch) -> None:
+    CandleFeatures.clear_cache()
+    frames = [make_candles(20, seed=seed) for seed in range(2)]
+
+    first = CandleFeatures.from_frame(frames[0], *OHLC)
+    columns_bytes = first.nbytes
+    monkeypatch.setattr(CandleFeatures, "cache_bytes", 3 * columns_bytes)
+    second = CandleFeatures.from_frame(frames[1], *OHLC)
+
+    for pattern in registry.pattern_names():
+        get_pattern(pattern).detect(first, False)
+    assert first.nbytes > 2 * columns_bytes
+
+    # Using the second candles again finds the cache over its size
+    assert CandleFeatures.from_frame(frames[1], *OHLC) is second
+    assert CandleFeatures.from_frame(frames[0], *OHLC) is not first
+    CandleFeatures.clear_cache()
+
+
+def test_cached_columns_do_not_follow_edits_of_the_frame(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(100)
+    features = CandleFeatures.from_frame(candles_df, *OHLC)
+
+    assert not np.shares_memory(features.close, candles_df["close"].to_numpy())
+    assert not features.close.flags.writeable
+
+
+def test_fingerprint_depends_on_dtype_and_shape() -> None:
+    values = np.arange(6, dtype=np.float64)
+
+    assert CandleFeatures.fingerprint(values) == CandleFeatures.fingerprint(values.copy())
+    assert CandleFeatures.fingerprint(values) != CandleFeatures.fingerprint(values.astype(np.float32))
+    assert CandleFeatures.fingerprint(values) != CandleFeatures.fingerprint(values.reshape(2, 3))
+
+
+def test_log_columns_and_detect_share_features(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder]) -> None:
+    candles_df = make_candles(100)
+    features = CandleFeatures.from_frame(candles_df, *OHLC)
+
+    assert np.allclose(features.log_close, np.log(candles_df["close"]))
+    assert get_pattern("Hammer").detect(features, False).tolist() == get_pattern("Hammer").has_pattern(
+        candles_df, OHLC, False, output="array"
+    ).tolist()
@@ -0,0 +1,39 @@
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick
+from app.candlestick.patterns.candle_array import CandleArray
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+@pytest.mark.parametrize("chunk_size", [1, 3, 7, 100, 599, 600, 5000])
+def test_chunked_scan_matches_single_scan(make_candles: Callable[..., pd.DataFrame], is_reversed: bool, chunk_size: int) -> None:
+    candles_df = make_candles(600)
+
+    result = candlestick.scan_chunked(candles_df, is_reversed=is_reversed, chunk_size=chunk_size)
+
+    assert result.equals(candlestick.scan_all(candles_df, is_reversed=is_reversed))
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_chunked_scan_on_process_pool(make_candles: Callable[..., pd.DataFrame], is_reversed: bool) -> None:
+    candles_df = make_candles(600)
+
+    result = candlestick.scan_chunked(candles_df, is_reversed=is_reversed, chunk_size=150, processes=2)
+
+    assert result.equals(candlestick.scan_all(candles_df, is_reversed=is_reversed))
+
+
+def test_chunked_scan_accepts_candle_array(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+
+    result = candlestick.scan_chunked(CandleArray.from_frame(candles_df), patterns=["Hammer"], chunk_size=64)
+
+    assert result.equals(candlestick.scan_all(candles_df, patterns=["Hammer"]))
+
+
+def test_chunked_scan_rejects_empty_chunks(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="Chunk size must be positive"):
+        candlestick.scan_chunked(make_candles(10), chunk_size=0)
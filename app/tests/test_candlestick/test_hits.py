@@ -0,0 +1,86 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry
+from app.candlestick.patterns.candle_array import CandleArray
+from app.candlestick.patterns.hits import Hits
+
+OHLC = ["open", "high", "low", "close"]
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_hits_match_array_output(make_candles: Callable[..., pd.DataFrame], is_reversed: bool) -> None:
+    candles_df = make_candles(300)
+    finder = registry.get_pattern("BullishEngulfing")
+
+    hits = finder.has_pattern(candles_df, OHLC, is_reversed, output="hits")
+
+    found = finder.has_pattern(candles_df, OHLC, is_reversed, output="array")
+    assert hits.length == len(candles_df)
+    assert hits.positions.dtype == np.int64
+    assert hits.positions.tolist() == np.flatnonzero(found).tolist()
+    assert hits.times is None
+    assert np.array_equal(hits.to_mask(), found)
+
+
+def test_hits_carry_epoch_ms_times(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(100)
+    candles_df["T"] = pd.date_range("2024-01-01", periods=100, freq="h")
+    finder = registry.get_pattern("Hammer")
+
+    hits = finder.has_pattern(candles_df, OHLC, False, output="hits", time_column="T")
+
+    expected = candles_df["T"].iloc[hits.positions].astype("datetime64[ms]").astype(np.int64)
+    assert hits.times.tolist() == expected.tolist()
+    assert finder.has_pattern(candles_df.set_index("T"), OHLC, False, output="hits") == hits
+    assert finder.has_pattern(CandleArray.from_frame(candles_df, time_column="T"), OHLC, False, output="hits") == hits
+
+
+def test_window_hits_use_positions_of_all_candles(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+    finder = registry.get_pattern("Hammer")
+    full = finder.has_pattern(candles_df, OHLC, False, output="hits")
+
+    hits = finder.has_pattern(candles_df, OHLC, False, output="hits", last=50)
+
+    assert hits.length == len(candles_df)
+    assert hits.positions.tolist() == [position for position in full.positions if position >= len(candles_df) - 50]
+
+
+def test_scan_all_hits_match_frame(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+
+    hits = candlestick.scan_all(candles_df, output="hits")
+    matrix = candlestick.scan_all(candles_df)
+
+    assert list(hits) == registry.pattern_names()
+    for pattern, pattern_hits in hits.items():
+        assert np.array_equal(pattern_hits.to_mask(), matrix[pattern].to_numpy())
+
+
+def test_set_operations() -> None:
+    first = Hits([2, 5, 9, 20], 30, [12, 15, 19, 30])
+    second = Hits([5, 11, 24], 30)
+
+    assert first.intersection(second).positions.tolist() == [5]
+    assert first.intersection(second).times.tolist() == [15]
+    assert first.union(second).positions.tolist() == [2, 5, 9, 11, 20, 24]
+    assert first.difference(second).positions.tolist() == [2, 9, 20]
+    assert first.within(second, 2).positions.tolist() == [5, 9]
+    assert first.within(second, 4).positions.tolist() == [2, 5, 9, 20]
+    assert first.within(second, 4, before_only=True).positions.tolist() == [5, 9]
+    assert first.within(Hits([], 30), 4).positions.tolist() == []
+
+
+def test_hits_round_trip_through_dict() -> None:
+    hits = Hits([1, 4], 10, [100, 400])
+
+    assert Hits.from_dict(hits.to_dict()) == hits
+
+
+def test_hits_from_different_candles_are_rejected() -> None:
+    with pytest.raises(Exception, match="same candles"):
+        Hits([1], 10).intersection(Hits([1], 11))
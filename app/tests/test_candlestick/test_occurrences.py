@@ -0,0 +1,120 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+
+from app.candlestick import candlestick
+from app.candlestick.occurrences import OccurrenceIndex
+
+PATTERNS = ["Doji", "BullishHarami", "MorningStar", "BearishThreeMethodFormation"]
+
+
+def expected_times(candles_df: pd.DataFrame, pattern: str) -> np.ndarray:
+    found = candlestick.scan_all(candles_df, patterns=[pattern])[pattern].to_numpy()
+    return candles_df["time"].to_numpy()[found].astype("datetime64[ms]").view(np.int64)
+
+
+def test_full_scan_builds_sorted_occurrences(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(600, seed=2)
+    index = OccurrenceIndex()
+
+    assert index.extend("BTCUSDT", "1h", candles_df, PATTERNS, time_column="time") == len(candles_df)
+
+    for pattern in PATTERNS:
+        assert np.array_equal(index.times("BTCUSDT", "1h", pattern), expected_times(candles_df, pattern))
+    assert index.checked_until("BTCUSDT", "1h") == pd.Timestamp(candles_df["time"].iloc[-1]).value // 1_000_000
+
+
+def test_extending_with_new_candles_matches_full_scan(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(600, seed=2)
+    index = OccurrenceIndex()
+
+    index.extend("BTCUSDT", "1h", candles_df.iloc[:300], PATTERNS, time_column="time")
+    # Polls overlap the candles already checked
+    assert index.extend("BTCUSDT", "1h", candles_df.iloc[250:451], PATTERNS, time_column="time") == 451 - 300
+    index.extend("BTCUSDT", "1h", candles_df.iloc[440:], PATTERNS, time_column="time")
+    assert index.extend("BTCUSDT", "1h", candles_df.iloc[500:], PATTERNS, time_column="time") == 0
+
+    for pattern in PATTERNS:
+        assert np.array_equal(index.times("BTCUSDT", "1h", pattern), expected_times(candles_df, pattern))
+
+
+def test_each_pattern_is_checked_on_its_own(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(500, seed=2)
+    index = OccurrenceIndex()
+
+    index.extend("BTCUSDT", "1h", candles_df.iloc[:400], ["Hammer"], time_column="time")
+    # Doji was never checked, so every candle is scanned for it
+    assert index.extend("BTCUSDT", "1h", candles_df, ["Doji"], time_column="time") == len(candles_df)
+    assert index.extend("BTCUSDT", "1h", candles_df, ["Hammer", "Doji"], time_column="time") == len(candles_df) - 400
+
+    for pattern in ["Hammer", "Doji"]:
+        assert np.array_equal(index.times("BTCUSDT", "1h", pattern), expected_times(candles_df, pattern))
+    assert len(index.times("BTCUSDT", "1h", "Doji")) > 0
+    assert index.checked_until("BTCUSDT", "1h", "Doji") == index.checked_until("BTCUSDT", "1h")
+
+
+def test_least_recently_extended_series_are_evicted(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    index = OccurrenceIndex(max_bytes=1)
+    index.extend("BTCUSDT", "1h", timed_candles(600, seed=2), ["Doji"], time_column="time")
+    index.extend("ETHUSDT", "1h", timed_candles(600, seed=3), ["Doji"], time_column="time")
+
+    assert index.symbols() == ["ETHUSDT"]
+    assert index.checked_until("BTCUSDT", "1h") is None
+    assert index.nbytes == index.times("ETHUSDT", "1h", "Doji").nbytes
+
+    # An evicted series is scanned again from its first candle
+    candles_df = timed_candles(600, seed=2)
+    assert index.extend("BTCUSDT", "1h", candles_df, ["Doji"], time_column="time") == len(candles_df)
+    assert np.array_equal(index.times("BTCUSDT", "1h", "Doji"), expected_times(candles_df, "Doji"))
+
+
+def test_last_and_between_queries(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(600, seed=2)
+    index = OccurrenceIndex()
+    index.extend("BTCUSDT", "1h", candles_df, PATTERNS, time_column="time")
+    times = expected_times(candles_df, "Doji")
+
+    assert np.array_equal(index.last("BTCUSDT", "1h", "Doji", 5), times[-5:])
+    assert np.array_equal(index.last("BTCUSDT", "1h", "Doji", 3, before=int(times[10])), times[7:10])
+
+    start, end = pd.Timestamp("2024-01-05"), pd.Timestamp("2024-01-10")
+    between = index.between("BTCUSDT", "1h", "Doji", start, end)
+    assert np.array_equal(between, times[(times >= start.value // 1_000_000) & (times <= end.value // 1_000_000)])
+
+    assert len(index.last("ETHUSDT", "1h", "Doji", 5)) == 0
+
+
+def test_symbols_and_intervals_are_kept_apart(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    index = OccurrenceIndex()
+    index.extend("BTCUSDT", "1h", timed_candles(600, seed=2), ["Doji"], time_column="time")
+    index.extend("ETHUSDT", "1h", timed_candles(600, seed=3), ["Doji"], time_column="time")
+    index.extend("BTCUSDT", "1d", timed_candles(600, seed=4), ["Doji"], time_column="time")
+
+    assert index.symbols() == ["BTCUSDT", "ETHUSDT"]
+    assert np.array_equal(index.times("ETHUSDT", "1h", "Doji"), expected_times(timed_candles(600, seed=3), "Doji"))
+    assert np.array_equal(index.times("BTCUSDT", "1d", "Doji"), expected_times(timed_candles(600, seed=4), "Doji"))
+
+
+def test_save_and_load(timed_candles: Callable[..., pd.DataFrame], tmp_path) -> None:
+    index = OccurrenceIndex()
+    index.extend("BTCUSDT", "1h", timed_candles(600, seed=2), PATTERNS, time_column="time")
+    index.extend("ETHUSDT", "1d", timed_candles(600, seed=3), PATTERNS, time_column="time")
+    path = tmp_path / "occurrences.npz"
+
+    index.save(path)
+    loaded = OccurrenceIndex.load(path)
+
+    for symbol, interval in [("BTCUSDT", "1h"), ("ETHUSDT", "1d")]:
+        assert loaded.checked_until(symbol, interval) == index.checked_until(symbol, interval)
+        for pattern in PATTERNS:
+            assert loaded.checked_until(symbol, interval, pattern) == index.checked_until(symbol, interval, pattern)
+            assert np.array_equal(loaded.times(symbol, interval, pattern), index.times(symbol, interval, pattern))
+
+
+def test_empty_index_round_trip(tmp_path) -> None:
+    path = tmp_path / "occurrences.npz"
+
+    OccurrenceIndex().save(path)
+
+    assert OccurrenceIndex.load(path).symbols() == []
@@ -0,0 +1,55 @@
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick
+
+
+def test_scan_panel_matches_per_symbol_scan_all(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+
+    matrix = candlestick.scan_panel(panel_df)
+
+    assert matrix.index.equals(panel_df.index)
+    for _, symbol_df in panel_df.groupby("symbol"):
+        expected = candlestick.scan_all(symbol_df.sort_values("time"))
+        assert matrix.loc[expected.index].equals(expected)
+
+
+def test_scan_panel_does_not_look_across_symbols(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT"])
+
+    matrix = candlestick.scan_panel(panel_df, patterns=["BullishThreeMethodFormation", "MorningStar"])
+    first_rows = panel_df.sort_values(["symbol", "time"]).groupby("symbol").head(4).index
+
+    assert not matrix.loc[first_rows, "BullishThreeMethodFormation"].any()
+
+
+def test_scan_panel_accepts_dict_of_arrays(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT"])
+    ohlc = ["open", "high", "low", "close"]
+    candles = {
+        symbol: {column: symbol_df.sort_values("time")[column].to_numpy() for column in ohlc}
+        for symbol, symbol_df in panel_df.groupby("symbol")
+    }
+
+    found = candlestick.scan_panel(candles)
+
+    assert list(found) == ["BTCUSDT", "ETHUSDT"]
+    for symbol, symbol_df in panel_df.groupby("symbol"):
+        expected = candlestick.scan_all(symbol_df.sort_values("time").reset_index(drop=True))
+        assert found[symbol].equals(expected)
+
+
+def test_scan_panel_process_pool_matches_single_process(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT"])
+
+    expected = candlestick.scan_panel(panel_df)
+
+    assert candlestick.scan_panel(panel_df, processes=2).equals(expected)
+
+
+def test_scan_panel_rejects_missing_columns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="Provided columns does not exist"):
+        candlestick.scan_panel(make_candles(20))
@@ -0,0 +1,89 @@
+import re
+import threading
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry
+
+PATTERN_COUNT = 27
+THREE_METHOD_CANDLES = 5
+
+
+def test_every_registered_pattern_has_a_helper() -> None:
+    names = registry.pattern_names()
+
+    assert len(names) == PATTERN_COUNT
+    for name in names:
+        helper = re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+        assert callable(getattr(candlestick, helper))
+
+
+def test_pattern_info_does_not_need_an_instance() -> None:
+    assert registry.pattern_info("MorningStar") == {
+        "name": "MorningStar",
+        "required_count": 3,
+        "lookback": 2,
+        "direction": "bullish",
+    }
+    assert registry.get_pattern_class("BearishThreeMethodFormation").required_count == THREE_METHOD_CANDLES
+
+
+def test_get_pattern_reuses_instances() -> None:
+    assert registry.get_pattern("Doji") is registry.get_pattern("Doji")
+    assert registry.get_pattern("Doji", "doji_col").target == "doji_col"
+
+
+def test_unknown_pattern_is_rejected() -> None:
+    with pytest.raises(Exception, match="is not a registered candlestick pattern"):
+        registry.get_pattern("BullishHangingMan")
+
+
+def test_helpers_do_not_write_to_stdout(make_candles: Callable[..., pd.DataFrame], capsys: pytest.CaptureFixture[str]) -> None:
+    candlestick.hammer(make_candles(20))
+
+    assert capsys.readouterr().out == ""
+
+
+def test_shared_instance_is_thread_safe(make_candles: Callable[..., pd.DataFrame]) -> None:
+    frames = [make_candles(300, seed) for seed in range(8)]
+    expected = [candlestick.morning_star(df)["MorningStar"].tolist() for df in frames]
+    results = [None] * len(frames)
+
+    def run(position: int) -> None:
+        for _ in range(20):
+            results[position] = candlestick.morning_star(frames[position])[
+                "MorningStar"
+            ].tolist()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(frames))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == expected
+
+
+def test_row_by_row_check_leaves_shared_instance_untouched(make_candles: Callable[..., pd.DataFrame]) -> None:
+    frames = [make_candles(120, seed) for seed in range(6)]
+    finder = registry.get_pattern("MorningStar")
+    ohlc = ["open", "high", "low", "close"]
+    expected = [finder.has_pattern(df, ohlc, False, output="series").tolist() for df in frames]
+    results = [None] * len(frames)
+
+    def run(position: int) -> None:
+        for is_reversed in (True, False) * 3:
+            found = finder.has_pattern(frames[position], ohlc, is_reversed, vectorized=False)
+        results[position] = [None if value is None else bool(value) for value in found["MorningStar"]]
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(frames))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[None if value is pd.NA else value for value in values] for values in expected]
+    assert finder.data is None
+    assert finder.multi_coeff == -1
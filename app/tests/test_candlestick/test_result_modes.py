@@ -0,0 +1,75 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+OHLC = ["open", "high", "low", "close"]
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_series_output_matches_frame_output(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder], is_reversed: bool) -> None:
+    candles_df = make_candles(200)
+    candles_df.index = pd.date_range("2024-01-01", periods=200, freq="h")
+
+    frame = get_pattern("MorningStar").has_pattern(candles_df, OHLC, is_reversed)
+    series = get_pattern("MorningStar").has_pattern(
+        candles_df, OHLC, is_reversed, output="series"
+    )
+
+    assert series.dtype == "boolean"
+    assert series.index.equals(candles_df.index)
+    assert series.isna().tolist() == frame["MorningStar"].isna().tolist()
+    assert series.fillna(False).tolist() == (frame["MorningStar"] == True).tolist()  # noqa: E712
+
+
+def test_array_output_is_plain_booleans(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder]) -> None:
+    candles_df = make_candles(200)
+
+    found = get_pattern("Hammer").has_pattern(candles_df, OHLC, False, output="array")
+    frame = get_pattern("Hammer").has_pattern(candles_df, OHLC, False)
+
+    assert isinstance(found, np.ndarray)
+    assert found.dtype == bool
+    assert found.tolist() == (frame["Hammer"] == True).tolist()  # noqa: E712
+
+
+def test_inplace_writes_result_column(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder]) -> None:
+    candles_df = make_candles(100)
+
+    result = get_pattern("BullishEngulfing").has_pattern(
+        candles_df, OHLC, False, inplace=True
+    )
+
+    assert result is candles_df
+    assert candles_df["BullishEngulfing"].dtype == "boolean"
+    assert pd.isna(candles_df["BullishEngulfing"].iloc[0])
+
+
+def test_unknown_output_is_rejected(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder]) -> None:
+    with pytest.raises(Exception, match="Output must be one of"):
+        get_pattern("Doji").has_pattern(make_candles(10), OHLC, False, output="list")
+
+
+@pytest.mark.parametrize("output", ["series", "array"])
+def test_series_and_array_outputs_read_candles_without_copies(
+    make_candles: Callable[..., pd.DataFrame],
+    get_pattern: Callable[[str], CandlestickFinder],
+    monkeypatch: pytest.MonkeyPatch,
+    output: str,
+) -> None:
+    candles_df = make_candles(200)
+    finder = get_pattern("Hammer")
+    detected = []
+
+    def detect(candles, is_reversed):
+        detected.append(candles)
+        return CandlestickFinder.detect(finder, candles, is_reversed)
+
+    monkeypatch.setattr(finder, "detect", detect)
+    finder.has_pattern(candles_df, OHLC, False, output=output)
+
+    for column in OHLC:
+        assert np.shares_memory(getattr(detected[0], column), candles_df[column].to_numpy())
@@ -0,0 +1,65 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, returns
+
+
+def naive_stats(candles_df: pd.DataFrame, found: pd.Series, horizon: int, sign: int) -> dict:
+    close = candles_df["close"].to_numpy()
+    moves, adverse = [], []
+    for position in np.flatnonzero(found.to_numpy(dtype=bool)):
+        if position + horizon >= len(close):
+            continue
+        path = [sign * np.log(close[position + step] / close[position]) for step in range(1, horizon + 1)]
+        moves.append(path[-1])
+        adverse.append(-min(0, *path))
+    return {
+        "hit_rate": np.mean(np.array(moves) > 0),
+        "mean_return": np.mean(moves),
+        "median_return": np.median(moves),
+        "mae": np.mean(adverse),
+    }
+
+
+@pytest.mark.parametrize("pattern, sign", [("Hammer", 1), ("BearishEngulfing", -1)])
+def test_pattern_returns_match_event_loop(make_candles: Callable[..., pd.DataFrame], pattern: str, sign: int) -> None:
+    candles_df = make_candles(600)
+    matrix = candlestick.scan_all(candles_df, patterns=[pattern])
+
+    summary = returns.pattern_returns(matrix, candles_df, horizons=(1, 6, 24))
+
+    assert summary.loc[pattern, "events"] == matrix[pattern].sum()
+    for horizon in (1, 6, 24):
+        expected = naive_stats(candles_df, matrix[pattern], horizon, sign)
+        for statistic, value in expected.items():
+            assert summary.loc[pattern, f"{statistic}_{horizon}"] == pytest.approx(value)
+
+
+def test_pattern_returns_accept_helper_output(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+
+    summary = returns.pattern_returns(candlestick.morning_star(candles_df))
+    expected = returns.pattern_returns(candlestick.scan_all(candles_df, patterns=["MorningStar"]), candles_df)
+
+    assert list(summary.index) == ["MorningStar"]
+    assert summary.equals(expected)
+
+
+def test_pattern_returns_without_events_are_nan(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(30)
+    signals = pd.Series(False, index=candles_df.index, name="Doji")
+
+    summary = returns.pattern_returns(signals, candles_df, horizons=(1,))
+
+    assert summary.loc["Doji", "events"] == 0
+    assert np.isnan(summary.loc["Doji", "mean_return_1"])
+
+
+def test_pattern_returns_rejects_misaligned_candles(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(30)
+
+    with pytest.raises(Exception, match="same length"):
+        returns.pattern_returns(candlestick.scan_all(candles_df), candles_df.iloc[:10])
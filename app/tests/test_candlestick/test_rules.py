@@ -0,0 +1,80 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, rules
+from app.candlestick.patterns.candle_features import CandleFeatures
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def test_composite_rule_matches_pandas(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(600)
+    rule = (rules.pattern("BullishEngulfing")
+            & (rules.column("close") > rules.column("close").sma(20))
+            & rules.pattern("Doji").shift(1).any(3))
+
+    result = rules.evaluate({"setup": rule}, candles_df)
+
+    matrix = candlestick.scan_all(candles_df, patterns=["BullishEngulfing", "Doji"])
+    sma = candles_df["close"].rolling(20).mean()
+    doji_before = matrix["Doji"].shift(1, fill_value=False).rolling(3, min_periods=1).max().astype(bool)
+    expected = matrix["BullishEngulfing"] & (candles_df["close"] > sma) & doji_before
+    assert result["setup"].tolist() == expected.tolist()
+
+
+def test_rolling_statistics_match_pandas(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(200)
+    close = rules.column("close")
+    result = rules.evaluate({
+        "above_max": close >= close.shift(1).rolling_max(5),
+        "below_min": close <= close.rolling_min(5),
+        "all_bullish": rules.column("bullish").all(3),
+    }, candles_df)
+
+    high = candles_df["close"].shift(1).rolling(5).max()
+    low = candles_df["close"].rolling(5).min()
+    bullish = (candles_df["close"] > candles_df["open"]).astype(int)
+    assert result["above_max"].tolist() == (candles_df["close"] >= high).tolist()
+    assert result["below_min"].tolist() == (candles_df["close"] <= low).tolist()
+    assert result["all_bullish"].tolist() == (
+        bullish.rolling(3, min_periods=1).sum() == bullish.rolling(3, min_periods=1).count()
+    ).tolist()
+
+
+def test_shared_subexpressions_are_computed_once(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles = CandleFeatures.from_frame(make_candles(100), *OHLC)
+    evaluator = rules.Evaluator(candles)
+    close = rules.column("close")
+    trend = close > close.sma(20)
+
+    for bars in range(1, 51):
+        evaluator.value(trend & rules.pattern("Hammer").shift(1).any(bars))
+        evaluator.value(rules.pattern("Hammer").shift(1).any(bars) & (rules.column("close") > close.sma(20)))
+
+    # close, its sma, the trend, the pattern and its shift, then a window
+    # and a conjunction per rule; the mirrored rules add nothing
+    assert evaluator.computed == 5 + 2 * 50
+
+
+def test_unknown_names_are_rejected(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="Bogus is not a registered candlestick pattern"):
+        rules.pattern("Bogus")
+
+    with pytest.raises(Exception, match="Unknown candle column volume"):
+        rules.evaluate(rules.column("volume") > 1, make_candles(10))
+
+    with pytest.raises(Exception, match="future candles"):
+        rules.column("close").shift(-1)
+
+
+def test_single_rule_keeps_index(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(30)
+    candles_df.index = pd.date_range("2024-01-01", periods=30, freq="D")
+
+    result = rules.evaluate(rules.column("bullish"), candles_df)
+
+    assert result.index.equals(candles_df.index)
+    assert np.array_equal(result["rule"].to_numpy(), candles_df["close"].to_numpy() > candles_df["open"].to_numpy())
@@ -0,0 +1,43 @@
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_scan_all_matches_single_pattern_helpers(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder], is_reversed: bool) -> None:
+    candles_df = make_candles(300)
+    ohlc = ["open", "high", "low", "close"]
+
+    matrix = candlestick.scan_all(candles_df, is_reversed=is_reversed)
+
+    assert list(matrix.columns) == registry.pattern_names()
+    assert (matrix.dtypes == bool).all()
+    for class_name in registry.pattern_names():
+        expected = get_pattern(class_name).has_pattern(candles_df, ohlc, is_reversed)
+        assert matrix[class_name].tolist() == (expected[class_name] == True).tolist()  # noqa: E712
+
+
+def test_scan_all_selected_patterns_keep_index_and_order(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(50)
+    candles_df.index = pd.date_range("2024-01-01", periods=50, freq="h")
+
+    matrix = candlestick.scan_all(candles_df, patterns=["Hammer", "Doji"])
+
+    assert list(matrix.columns) == ["Hammer", "Doji"]
+    assert matrix.index.equals(candles_df.index)
+
+
+def test_scan_all_coerces_string_columns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(50)
+    string_df = candles_df.astype(str)
+
+    assert candlestick.scan_all(string_df).equals(candlestick.scan_all(candles_df))
+
+
+def test_scan_all_rejects_missing_columns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="Provided columns does not exist"):
+        candlestick.scan_all(make_candles(10), ohlc=["o", "h", "l", "c"])
@@ -0,0 +1,133 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry
+from app.candlestick.patterns.candle_features import CandleFeatures
+
+
+@pytest.mark.parametrize("pattern", registry.pattern_names())
+def test_scores_are_set_exactly_on_hits(make_candles: Callable[..., pd.DataFrame], pattern: str) -> None:
+    candles_df = make_candles(400, seed=5)
+    candles = CandleFeatures.from_frame(candles_df, "open", "high", "low", "close")
+    finder = registry.get_pattern(pattern)
+
+    for is_reversed in (False, True):
+        scores = finder.score(candles, is_reversed)
+        found = finder.detect(candles, is_reversed)
+
+        assert np.array_equal(~np.isnan(scores), found)
+        assert ((scores[found] >= 0) & (scores[found] <= 1)).all()
+
+
+def smooth_candles(rows: int, seed: int = 7) -> pd.DataFrame:
+    # Unrounded prices, where two hits tie only if their scores saturate
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(rng.normal(0, 0.01, rows).cumsum())
+    open_ = np.concatenate([[100], close[:-1]]) * np.exp(rng.normal(0, 0.002, rows))
+    high = np.maximum(open_, close) * np.exp(np.abs(rng.normal(0, 0.004, rows)))
+    low = np.minimum(open_, close) * np.exp(-np.abs(rng.normal(0, 0.004, rows)))
+    return pd.DataFrame({"open": open_, "high": high, "low": low, "close": close})
+
+
+@pytest.mark.parametrize("pattern", ["BearishThreeMethodFormation", "BullishThreeMethodFormation",
+                                     "MorningStar", "EveningStar"])
+def test_ratio_scores_stay_below_one(pattern: str) -> None:
+    candles = CandleFeatures.from_frame(smooth_candles(5000), "open", "high", "low", "close")
+
+    scores = registry.get_pattern(pattern).score(candles, False)
+
+    assert (~np.isnan(scores)).any()
+    assert np.nanmax(scores) < 1
+
+
+def test_doji_score_grows_as_the_body_shrinks() -> None:
+    candles_df = pd.DataFrame({"open": [10.0, 10.0, 10.0],
+                               "high": [11.0, 11.0, 11.0],
+                               "low": [9.0, 9.0, 9.0],
+                               "close": [10.15, 10.05, 10.0]})
+    candles = CandleFeatures.from_frame(candles_df, "open", "high", "low", "close")
+
+    scores = registry.get_pattern("Doji").score(candles, False)
+
+    assert np.allclose(scores, [0.25, 0.75, 1.0])
+
+
+def test_engulfing_score_measures_coverage_of_previous_body() -> None:
+    candles_df = pd.DataFrame({"open": [10.5, 10.0, 10.5, 10.0],
+                               "high": [10.6, 11.2, 10.6, 12.2],
+                               "low": [9.9, 9.8, 9.9, 9.8],
+                               "close": [10.0, 11.0, 10.0, 12.0]})
+    candles = CandleFeatures.from_frame(candles_df, "open", "high", "low", "close")
+
+    scores = registry.get_pattern("BullishEngulfing").score(candles, False)
+
+    assert np.isnan(scores[[0, 2]]).all()
+    assert np.allclose(scores[[1, 3]], [0.5, 0.75])
+
+
+def test_scan_all_scores_output(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300, seed=2)
+
+    scores = candlestick.scan_all(candles_df, output="scores")
+    found = candlestick.scan_all(candles_df)
+
+    assert scores.columns.equals(found.columns)
+    assert scores.notna().equals(found)
+
+
+def test_scan_top_returns_strongest_hits_of_the_universe(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT", "SOLUSDT"])
+
+    k = 15
+    top = candlestick.scan_top(panel_df, k=k)
+
+    expected = []
+    for symbol, symbol_df in panel_df.groupby("symbol"):
+        scores = candlestick.scan_all(symbol_df.sort_values("time"), output="scores")
+        stacked = scores.stack().dropna()
+        expected.extend((symbol, row, pattern, score) for (row, pattern), score in stacked.items())
+
+    expected_scores = sorted((score for _, _, _, score in expected), reverse=True)[:k]
+
+    assert list(top.columns) == ["symbol", "row", "pattern", "score"]
+    assert len(top) == k
+    assert np.allclose(top["score"], expected_scores)
+    assert top["score"].is_monotonic_decreasing
+    for signal in top.itertuples(index=False):
+        assert panel_df.loc[signal.row, "symbol"] == signal.symbol
+        assert (signal.symbol, signal.row, signal.pattern, signal.score) in expected
+
+
+def test_scan_top_is_not_made_of_ties() -> None:
+    k = 50
+    top = candlestick.scan_top({"BTCUSDT": smooth_candles(5000)}, k=k)
+
+    assert top["score"].nunique() == len(top) == k
+
+
+def test_scan_top_accepts_dict_of_symbols(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT", "ETHUSDT"])
+    candles = {symbol: symbol_df.sort_values("time").reset_index(drop=True)
+               for symbol, symbol_df in panel_df.groupby("symbol")}
+
+    top = candlestick.scan_top(candles, k=5, patterns=["Doji", "Hammer"])
+
+    for signal in top.itertuples(index=False):
+        scores = candlestick.scan_all(candles[signal.symbol], patterns=["Doji", "Hammer"], output="scores")
+        assert scores.loc[signal.row, signal.pattern] == signal.score
+
+
+def test_scan_top_returns_every_hit_when_there_are_fewer_than_k(make_panel: Callable[..., pd.DataFrame]) -> None:
+    panel_df = make_panel(["BTCUSDT"])
+
+    top = candlestick.scan_top(panel_df, k=100000, patterns=["Doji"])
+
+    assert len(top) == candlestick.scan_panel(panel_df, patterns=["Doji"])["Doji"].sum()
+
+
+def test_scan_top_rejects_empty_k(make_panel: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception):
+        candlestick.scan_top(make_panel(["BTCUSDT"]), k=0)
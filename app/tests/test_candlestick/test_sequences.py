@@ -0,0 +1,93 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry, sequences
+from app.candlestick.returns import direction_sign
+
+
+def naive_sequences(found: pd.DataFrame, close: np.ndarray, gap: int, horizon: int) -> dict:
+    log_close = np.log(close)
+    table = {}
+
+    for first in found.columns:
+        for then in found.columns:
+            events = [row for row in range(len(found))
+                      if found[then].iloc[row] and found[first].iloc[max(row - gap, 0):row].any()]
+            if not events:
+                continue
+
+            sign = direction_sign(registry.pattern_info(then)["direction"])
+            returns = [sign * (log_close[row + horizon] - log_close[row])
+                       for row in events if row + horizon < len(log_close)]
+            table[(first, then)] = (len(events),
+                                    np.mean(np.array(returns) > 0) if returns else np.nan,
+                                    np.mean(returns) if returns else np.nan)
+
+    return table
+
+
+def test_sequences_match_naive_count(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(400, seed=1)
+    found = candlestick.scan_all(candles_df, patterns=["Doji", "Hammer", "InvertedHammer", "BearishHarami"])
+
+    result = sequences.pattern_sequences(found, candles_df, gap=3, horizons=[2])
+    expected = naive_sequences(found, candles_df["close"].to_numpy(), 3, 2)
+
+    assert set(result.index) == set(expected)
+    for key, (events, hit_rate, mean_return) in expected.items():
+        assert result.loc[key, "events"] == events
+        assert np.isclose(result.loc[key, "hit_rate_2"], hit_rate, equal_nan=True)
+        assert np.isclose(result.loc[key, "mean_return_2"], mean_return, equal_nan=True)
+
+
+def test_sequences_from_masks_match_frame(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(400, seed=1)
+    found = candlestick.scan_all(candles_df)
+    masks = candlestick.scan_all(candles_df, output="mask")
+
+    from_frame = sequences.pattern_sequences(found, candles_df, gap=2)
+    from_masks = sequences.pattern_sequences(masks, candles_df, gap=2)
+
+    assert from_masks.equals(from_frame)
+
+
+def test_sequences_of_helper_output(make_candles: Callable[..., pd.DataFrame]) -> None:
+    doji_df = candlestick.doji(make_candles(300, seed=2))
+
+    result = sequences.pattern_sequences(doji_df, gap=4)
+
+    assert list(result.index) == [("Doji", "Doji")]
+    assert result["events"].iloc[0] > 0
+
+
+def test_universe_adds_up_symbols_without_crossing_them(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles = {"BTCUSDT": make_candles(300, seed=1), "ETHUSDT": make_candles(250, seed=2)}
+    signals = {symbol: candlestick.scan_all(candles_df) for symbol, candles_df in candles.items()}
+
+    universe = sequences.pattern_sequences(signals, candles, gap=3, horizons=[1])
+    separate = [sequences.pattern_sequences(signals[symbol], candles[symbol], gap=3, horizons=[1])
+                for symbol in candles]
+
+    events = separate[0]["events"].add(separate[1]["events"], fill_value=0)
+    assert universe["events"].sort_index().equals(events.sort_index().astype(np.int64))
+
+
+def test_min_events_and_sorting(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(600, seed=3)
+    found = candlestick.scan_all(candles_df)
+
+    min_events = 5
+    result = sequences.pattern_sequences(found, candles_df, gap=3, min_events=min_events)
+
+    assert (result["events"] >= min_events).all()
+    assert result["events"].is_monotonic_decreasing
+
+
+def test_gap_must_be_positive(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(50)
+
+    with pytest.raises(Exception):
+        sequences.pattern_sequences(candlestick.scan_all(candles_df), candles_df, gap=0)
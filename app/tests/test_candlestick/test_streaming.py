@@ -0,0 +1,67 @@
+from collections.abc import Callable
+
+import pandas as pd
+
+from app.candlestick import candlestick, registry
+from app.candlestick.streaming import CandlestickStream
+
+
+def test_stream_matches_batch_scan(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+    matrix = candlestick.scan_all(candles_df)
+    stream = CandlestickStream()
+
+    for row_idx, row in enumerate(candles_df.itertuples(index=False)):
+        found = stream.update(row.open, row.high, row.low, row.close)
+
+        expected = matrix.columns[matrix.iloc[row_idx].to_numpy()].tolist()
+        assert found == expected
+
+
+def test_stream_keeps_only_required_window() -> None:
+    stream = CandlestickStream(patterns=["Hammer", "MorningStar"])
+
+    for price in range(10):
+        stream.update(price, price + 1, price - 1, price)
+
+    assert stream.window == registry.get_pattern_class("MorningStar").required_count
+    assert len(stream.candles()) == stream.window
+    assert stream.candles().close.tolist() == [7, 8, 9]
+
+
+def test_peek_matches_batch_scan_with_forming_candle(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(200)
+    matrix = candlestick.scan_all(candles_df)
+    stream = CandlestickStream()
+
+    for row_idx, row in enumerate(candles_df.itertuples(index=False)):
+        provisional = stream.peek(row.open, row.high, row.low, row.close)
+
+        assert provisional == matrix.columns[matrix.iloc[row_idx].to_numpy()].tolist()
+        assert stream.update(row.open, row.high, row.low, row.close) == provisional
+
+
+def test_peek_leaves_closed_candles_alone(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(120)
+    peeking = CandlestickStream(patterns=["Hammer", "BullishEngulfing", "MorningStar"])
+    plain = CandlestickStream(patterns=["Hammer", "BullishEngulfing", "MorningStar"])
+
+    for row in candles_df.itertuples(index=False):
+        peeking.peek(row.high, row.high, row.low, row.low)
+        assert peeking.update(row.open, row.high, row.low, row.close) == \
+            plain.update(row.open, row.high, row.low, row.close)
+
+
+def test_ticks_build_the_forming_candle() -> None:
+    stream = CandlestickStream(patterns=["Hammer"])
+    stream.update(10, 10.5, 9.5, 10)
+
+    for price in [10, 10.2, 9, 9.8, 10.1]:
+        found = stream.tick(price)
+
+    assert stream.forming == [10, 10.2, 9, 10.1]
+    assert found == stream.peek(10, 10.2, 9, 10.1)
+
+    stream.update(10, 10.2, 9, 10.1)
+    assert stream.forming is None
+    assert stream.tick(11) == stream.peek(11, 11, 11, 11)
@@ -0,0 +1,85 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import registry, sweep
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def test_thresholds_lists_constructor_defaults() -> None:
+    assert sweep.thresholds("HangingMan") == {"range_multiple": 4, "shadow_ratio": 0.75}
+    assert sweep.thresholds("BullishEngulfing") == {}
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_custom_thresholds_match_row_logic(make_candles: Callable[..., pd.DataFrame], is_reversed: bool) -> None:
+    candles_df = make_candles(300)
+    pattern_class = registry.get_pattern_class("HangingMan")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = pattern_class(shadow_ratio=0.6).has_pattern(candles_df, OHLC, is_reversed, vectorized=False)
+    result = pattern_class(shadow_ratio=0.6).has_pattern(candles_df, OHLC, is_reversed)
+
+    assert result["HangingMan"].tolist() == expected["HangingMan"].tolist()
+
+
+def test_sweep_matches_one_run_per_threshold(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(600)
+    grid = [0.05, 0.1, 0.2, 0.3]
+
+    summary = sweep.sweep(candles_df, "Doji", {"max_body_ratio": grid}, horizons=(1, 3))
+
+    log_close = np.log(candles_df["close"].to_numpy())
+    for row, value in zip(summary.itertuples(), grid):
+        found = registry.get_pattern_class("Doji")(max_body_ratio=value).has_pattern(
+            candles_df, OHLC, False, output="array"
+        )
+        positions = np.flatnonzero(found)
+        positions = positions[positions + 3 < len(log_close)]
+        returns = log_close[positions + 3] - log_close[positions]
+
+        assert row.hits == found.sum()
+        assert row.mean_return_3 == pytest.approx(returns.mean())
+        assert row.hit_rate_3 == pytest.approx((returns > 0).mean())
+
+
+def test_sweep_crosses_several_thresholds(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300)
+
+    grid = {"range_multiple": [2, 3], "shadow_ratio": [0.5, 0.6, 0.7]}
+    summary = sweep.sweep(candles_df, "Hammer", grid)
+
+    assert len(summary) == len(grid["range_multiple"]) * len(grid["shadow_ratio"])
+    assert summary[["range_multiple", "shadow_ratio"]].iloc[4].tolist() == [3, 0.6]
+    assert summary["hits"].iloc[4] == registry.get_pattern("Hammer").has_pattern(
+        candles_df, OHLC, False, output="array"
+    ).sum()
+
+
+def test_sweep_hits_grow_with_tolerance(make_candles: Callable[..., pd.DataFrame]) -> None:
+    summary = sweep.sweep(make_candles(300), "TweezerTops", {"tolerance": [0.001, 0.005, 0.01]})
+
+    assert summary["hits"].is_monotonic_increasing
+
+
+def test_sweep_flips_returns_of_bearish_patterns(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(600)
+
+    summary = sweep.sweep(candles_df, "HangingMan", {"shadow_ratio": [0.5]}, horizons=(1,))
+    found = registry.get_pattern_class("HangingMan")(shadow_ratio=0.5).has_pattern(
+        candles_df, OHLC, False, output="array"
+    )
+    log_close = np.log(candles_df["close"].to_numpy())
+    positions = np.flatnonzero(found[:-1])
+
+    assert summary["mean_return_1"].iloc[0] == pytest.approx(
+        (log_close[positions] - log_close[positions + 1]).mean()
+    )
+
+
+def test_sweep_rejects_unknown_threshold(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="Doji has no threshold named tolerance"):
+        sweep.sweep(make_candles(20), "Doji", {"tolerance": [0.1]})
@@ -0,0 +1,105 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import candlestick, registry
+from app.candlestick.patterns import transforms
+from app.candlestick.patterns.candle_array import CandleArray
+from app.candlestick.patterns.candle_features import CandleFeatures
+
+OHLC = ["open", "high", "low", "close"]
+
+
+def heikin_ashi_frame(candles_df: pd.DataFrame) -> pd.DataFrame:
+    ha_df = pd.DataFrame(index=candles_df.index)
+    ha_df["close"] = candles_df[OHLC].mean(axis=1)
+
+    ha_open = [(candles_df["open"].iloc[0] + candles_df["close"].iloc[0]) / 2]
+    for ha_close in ha_df["close"].iloc[:-1]:
+        ha_open.append((ha_open[-1] + ha_close) / 2)
+    ha_df["open"] = ha_open
+
+    ha_df["high"] = pd.concat([candles_df["high"], ha_df["open"], ha_df["close"]], axis=1).max(axis=1)
+    ha_df["low"] = pd.concat([candles_df["low"], ha_df["open"], ha_df["close"]], axis=1).min(axis=1)
+    return ha_df[OHLC]
+
+
+@pytest.mark.parametrize("rows", [1, 2, transforms.block_size, transforms.block_size + 1, 1500])
+def test_heikin_ashi_matches_recursive_definition(make_candles: Callable[..., pd.DataFrame], rows: int) -> None:
+    candles_df = make_candles(rows, seed=6)
+
+    ha = transforms.heikin_ashi(*[candles_df[column].to_numpy() for column in OHLC])
+
+    expected = heikin_ashi_frame(candles_df)
+    for values, column in zip(ha, OHLC):
+        assert np.allclose(values, expected[column], rtol=1e-12)
+
+
+def test_transforms_are_computed_once_per_candles(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(200)
+    candles = CandleFeatures.from_frame(candles_df, *OHLC)
+
+    assert candles.transform("heikin_ashi") is candles.transform("heikin_ashi")
+    assert CandleFeatures.from_frame(candles_df, *OHLC).transform("heikin_ashi") is candles.transform("heikin_ashi")
+
+
+def test_log_transform_shares_the_log_prices(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles = CandleFeatures.from_frame(make_candles(200), *OHLC)
+
+    transformed = candles.transform("log")
+
+    assert np.shares_memory(transformed.close, candles.log_close)
+    assert not transformed.close.flags.writeable
+
+
+def test_prices_of_transforms(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles = CandleFeatures.from_frame(make_candles(200), *OHLC)
+
+    assert candles.prices is candles.log_close
+    assert candles.transform("log").prices is candles.transform("log").close
+    assert candles.transform("zscore").prices is candles.transform("zscore").close
+    assert np.array_equal(candles.transform("heikin_ashi").prices, np.log(candles.transform("heikin_ashi").close))
+
+
+def test_zscore_transform(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles = CandleFeatures.from_frame(make_candles(200), *OHLC).transform("zscore")
+
+    assert np.isclose(candles.close.mean(), 0)
+    assert np.isclose(candles.close.std(), 1)
+    assert (candles.high >= candles.low).all()
+
+
+def test_unknown_transform(make_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception):
+        CandleFeatures.from_frame(make_candles(20), *OHLC).transform("renko")
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_scan_all_on_heikin_ashi_matches_scan_of_transformed_frame(make_candles: Callable[..., pd.DataFrame], is_reversed: bool) -> None:
+    candles_df = make_candles(300, seed=2)
+
+    found = candlestick.scan_all(candles_df, is_reversed=is_reversed, transform="heikin_ashi")
+
+    assert found.equals(candlestick.scan_all(heikin_ashi_frame(candles_df), is_reversed=is_reversed))
+
+
+def test_has_pattern_with_transform(make_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = make_candles(300, seed=2)
+    finder = registry.get_pattern("Doji")
+
+    found = finder.has_pattern(candles_df, OHLC, False, output="array", transform="heikin_ashi")
+    from_array = finder.has_pattern(CandleArray.from_frame(candles_df), OHLC, False, output="array",
+                                    transform="heikin_ashi")
+
+    expected = finder.has_pattern(heikin_ashi_frame(candles_df), OHLC, False, output="array")
+    assert np.array_equal(found, expected)
+    assert np.array_equal(from_array, expected)
+
+
+def test_transforms_need_every_candle(make_candles: Callable[..., pd.DataFrame]) -> None:
+    finder = registry.get_pattern("Doji")
+
+    with pytest.raises(Exception):
+        finder.has_pattern(make_candles(100), OHLC, False, last=10, transform="log")
@@ -0,0 +1,100 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import registry
+from app.candlestick.patterns.candle_features import CandleFeatures
+
+REVERSAL_PATTERNS = ["Hammer", "HangingMan", "ShootingStar", "MorningStar", "EveningStar"]
+
+
+@pytest.fixture(name="features")
+def fixture_features(make_candles: Callable[..., pd.DataFrame]) -> Callable[..., CandleFeatures]:
+    def features(rows: int = 400, seed: int = 4) -> CandleFeatures:
+        candles_df = make_candles(rows, seed=seed)
+        return CandleFeatures.from_frame(candles_df, "open", "high", "low", "close")
+
+    return features
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_trend_matches_naive_computation(features: Callable[..., CandleFeatures], is_reversed: bool) -> None:
+    candles = features(60)
+    log_close = np.log(candles.close)
+    if is_reversed:
+        log_close = log_close[::-1]
+
+    returns = candles.trend(5, "return", is_reversed)
+    slopes = candles.trend(5, "slope", is_reversed)
+    if is_reversed:
+        returns, slopes = returns[::-1], slopes[::-1]
+
+    assert np.isnan(returns[:5]).all()
+    assert np.allclose(returns[5:], log_close[5:] - log_close[:-5])
+    assert np.isnan(slopes[:4]).all()
+    assert np.allclose(slopes[4:], [np.polyfit(np.arange(5), log_close[i - 4:i + 1], 1)[0]
+                                    for i in range(4, len(log_close))])
+
+
+def test_trend_rejects_unknown_method(features: Callable[..., CandleFeatures]) -> None:
+    with pytest.raises(Exception):
+        features().trend(5, "curvature")
+
+
+@pytest.mark.parametrize("pattern", REVERSAL_PATTERNS)
+@pytest.mark.parametrize("is_reversed", [False, True])
+@pytest.mark.parametrize("method", ["return", "slope"])
+def test_gated_patterns_only_keep_hits_after_the_prior_trend(features: Callable[..., CandleFeatures], pattern: str, is_reversed: bool, method: str) -> None:
+    candles = features()
+    pattern_class = registry.get_pattern_class(pattern)
+    gated = pattern_class(trend_bars=6, trend_method=method)
+
+    gate = gated.trend_gate(candles, is_reversed)
+    found = gated.detect(candles, is_reversed)
+
+    assert np.array_equal(found, pattern_class().detect(candles, is_reversed) & gate)
+
+    trend = candles.trend(6, method, is_reversed)
+    shift = pattern_class.required_count
+    rows = np.flatnonzero(found)
+    prior = trend[rows + shift] if is_reversed else trend[rows - shift]
+    assert ((prior < 0) if pattern_class.prior_trend == "down" else (prior > 0)).all()
+
+
+@pytest.mark.parametrize("pattern", registry.pattern_names())
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_sparse_gate_checks_only_passing_candles(features: Callable[..., CandleFeatures], pattern: str, is_reversed: bool) -> None:
+    candles = features()
+    finder = registry.get_pattern(pattern)
+    multi_coeff = 1 if is_reversed else -1
+
+    # Few candles pass, including the first and last ones whose neighbours wrap
+    gate = np.zeros(len(candles), dtype=bool)
+    gate[[0, 1, 2, 57, 123, 250, 251, len(candles) - 2, len(candles) - 1]] = True
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = np.asarray(finder.vectorized_logic(candles, multi_coeff), dtype=bool) & gate
+        found = finder.gated_logic(candles, gate, multi_coeff)
+
+    assert np.array_equal(found, expected)
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+def test_row_logic_skips_candles_failing_the_gate(make_candles: Callable[..., pd.DataFrame], is_reversed: bool) -> None:
+    candles_df = make_candles(150, seed=4)
+    ohlc = ["open", "high", "low", "close"]
+    hammer = registry.get_pattern_class("Hammer")(trend_bars=4)
+
+    by_row = hammer.has_pattern(candles_df, ohlc, is_reversed, vectorized=False)
+    vectorized = hammer.has_pattern(candles_df, ohlc, is_reversed)
+
+    assert by_row["Hammer"].equals(vectorized["Hammer"])
+
+
+def test_patterns_are_not_gated_by_default(features: Callable[..., CandleFeatures]) -> None:
+    candles = features()
+
+    assert registry.get_pattern("Hammer").trend_gate(candles, False) is None
+    assert registry.get_pattern_class("Doji")().trend_gate(candles, False) is None
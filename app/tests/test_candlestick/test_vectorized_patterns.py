@@ -0,0 +1,34 @@
+from collections.abc import Callable
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import registry
+from app.candlestick.patterns.candlestick_finder import CandlestickFinder
+
+
+@pytest.mark.parametrize("is_reversed", [False, True])
+@pytest.mark.parametrize("class_name", registry.pattern_names())
+def test_vectorized_matches_row_logic(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder], class_name: str, is_reversed: bool) -> None:
+    candles_df = make_candles(600)
+    ohlc = ["open", "high", "low", "close"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        expected = get_pattern(class_name).has_pattern(
+            candles_df, ohlc, is_reversed, vectorized=False
+        )
+    result = get_pattern(class_name).has_pattern(candles_df, ohlc, is_reversed)
+
+    assert result[class_name].tolist() == expected[class_name].tolist()
+
+
+def test_vectorized_keeps_warm_up_rows_empty(make_candles: Callable[..., pd.DataFrame], get_pattern: Callable[[str], CandlestickFinder]) -> None:
+    candles_df = make_candles(10)
+
+    result = get_pattern("MorningStar").has_pattern(
+        candles_df, ["open", "high", "low", "close"], False
+    )
+
+    assert result["MorningStar"].iloc[:2].isna().all()
+    assert result["MorningStar"].iloc[2:].notna().all()
@@ -0,0 +1,76 @@
+from collections.abc import Callable
+
+import pandas as pd
+import pytest
+
+from app.candlestick import registry
+from app.candlestick.patterns.candle_array import CandleArray
+
+OHLC = ["open", "high", "low", "close"]
+
+
+@pytest.mark.parametrize("class_name", registry.pattern_names())
+def test_last_window_matches_full_scan(timed_candles: Callable[..., pd.DataFrame], class_name: str) -> None:
+    candles_df = timed_candles(300, time_column="T")
+    finder = registry.get_pattern(class_name)
+    full = finder.has_pattern(candles_df, OHLC, False)
+
+    for last in (1, 3, 20, 300, 500):
+        assert finder.has_pattern(candles_df, OHLC, False, last=last).equals(full.iloc[-last:])
+        assert finder.has_pattern(candles_df, OHLC, False, last=last, output="array").tolist() == \
+            finder.has_pattern(candles_df, OHLC, False, output="array")[-last:].tolist()
+
+
+def test_since_window_matches_full_scan(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(300, time_column="T")
+    finder = registry.get_pattern("BullishThreeMethodFormation")
+
+    result = finder.has_pattern(candles_df, OHLC, False, since=candles_df["T"][250], time_column="T")
+
+    assert result.equals(finder.has_pattern(candles_df, OHLC, False).iloc[250:])
+
+
+def test_window_on_short_history_keeps_warm_up_rows_empty(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(3, time_column="T")
+
+    result = registry.get_pattern("MorningStar").has_pattern(candles_df, OHLC, False, last=2)
+
+    assert result["MorningStar"].tolist() == [None, False]
+
+
+def test_window_inplace_leaves_older_candles_unchecked(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(100, time_column="T")
+    expected = registry.get_pattern("Hammer").has_pattern(candles_df, OHLC, False, output="series")
+
+    result = registry.get_pattern("Hammer").has_pattern(candles_df.copy(), OHLC, False, last=10, inplace=True)
+
+    assert result["Hammer"].iloc[:-10].isna().all()
+    assert result["Hammer"].iloc[-10:].equals(expected.iloc[-10:])
+
+
+def test_window_accepts_candle_array(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(100, time_column="T")
+    candles = CandleArray.from_frame(candles_df, time_column="T")
+    finder = registry.get_pattern("TweezerTops")
+
+    result = finder.has_pattern(candles, OHLC, False, since=candles_df["T"][90], output="series")
+
+    assert result.tolist() == finder.has_pattern(candles_df, OHLC, False, output="series").iloc[90:].tolist()
+
+
+def test_window_of_candle_array_since_epoch_ms(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    candles_df = timed_candles(100, time_column="T")
+    candles = CandleArray.from_frame(candles_df, time_column="T")
+    finder = registry.get_pattern("TweezerTops")
+
+    result = finder.has_pattern(candles, OHLC, False, since=int(candles.time[90]), output="series")
+
+    assert result.tolist() == finder.has_pattern(candles_df, OHLC, False, output="series").iloc[90:].tolist()
+
+    with pytest.raises(Exception, match="no times"):
+        finder.has_pattern(CandleArray.from_frame(candles_df), OHLC, False, since=int(candles.time[90]))
+
+
+def test_window_needs_chronological_order(timed_candles: Callable[..., pd.DataFrame]) -> None:
+    with pytest.raises(Exception, match="chronological order"):
+        registry.get_pattern("Doji").has_pattern(timed_candles(10, time_column="T"), OHLC, True, last=5)
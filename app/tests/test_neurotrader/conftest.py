@@ -0,0 +1,20 @@
+import importlib.util
+import sys
+import types
+
+import pytest
+
+plotting = pytest.MonkeyPatch()
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    # The chart detectors import plotting libraries they only use to draw
+    # results; stand-ins let them be tested where those are not installed
+    for package, modules in (("matplotlib", ("matplotlib", "matplotlib.pyplot")), ("mplfinance", ("mplfinance",))):
+        if importlib.util.find_spec(package) is None:
+            for name in modules:
+                plotting.setitem(sys.modules, name, types.ModuleType(name))
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    plotting.undo()
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.candlestick import registry
+from app.candlestick.patterns.candle_array import CandleArray
+from app.candlestick.patterns.candle_features import CandleFeatures
+from app.neurotrader.TechnicalAnalysisAutomation.flags_pennants import (
+    find_flags_pennants_pips,
+    find_flags_pennants_trendline,
+)
+from app.neurotrader.TechnicalAnalysisAutomation.head_shoulders import find_hs_patterns
+
+OHLC = ["open", "high", "low", "close"]
+
+HISTORY = Path(__file__).parents[2] / "neurotrader" / "TechnicalAnalysisAutomation" / "BTCUSDT3600.csv"
+
+
+def btc_candles(rows: int = 3000) -> pd.DataFrame:
+    return pd.read_csv(HISTORY, nrows=rows, parse_dates=["date"])
+
+
+def as_tuples(found: tuple) -> list:
+    return [[vars(pattern) for pattern in patterns] for patterns in found]
+
+
+@pytest.mark.parametrize("find_flags_pennants", [find_flags_pennants_pips, find_flags_pennants_trendline])
+def test_flags_pennants_of_candle_array(find_flags_pennants) -> None:
+    candles_df = btc_candles()
+
+    found = find_flags_pennants(CandleArray.from_frame(candles_df, time_column="date"), 12)
+
+    expected = find_flags_pennants(np.log(candles_df["close"].to_numpy()), 12)
+    assert as_tuples(found) == as_tuples(expected)
+    assert sum(len(patterns) for patterns in found) > 0
+
+
+def test_hs_patterns_of_candle_array() -> None:
+    candles_df = btc_candles()
+
+    found = find_hs_patterns(CandleArray.from_frame(candles_df, time_column="date"), 6)
+
+    expected = find_hs_patterns(np.log(candles_df["close"].to_numpy()), 6)
+    assert as_tuples(found) == as_tuples(expected)
+    assert sum(len(patterns) for patterns in found) > 0
+
+
+def test_candlestick_and_chart_detectors_share_features() -> None:
+    candles_df = btc_candles()
+    features = CandleFeatures.from_frame(candles_df, *OHLC)
+    log_close = np.log(candles_df["close"].to_numpy())
+
+    found = registry.get_pattern("Doji").has_pattern(candles_df, OHLC, False, output="array")
+    hs_found = find_hs_patterns(features, 6)
+    pips_found = find_flags_pennants_pips(features, 12)
+    trendline_found = find_flags_pennants_trendline(features, 12)
+
+    # The finder and every chart detector worked on the same cached features
+    assert CandleFeatures.from_frame(candles_df, *OHLC) is features
+    assert features.log_close is vars(features)["log_close"]
+    assert np.array_equal(found, registry.get_pattern("Doji").detect(features, False))
+    assert as_tuples(hs_found) == as_tuples(find_hs_patterns(log_close, 6))
+    assert as_tuples(pips_found) == as_tuples(find_flags_pennants_pips(log_close, 12))
+    assert as_tuples(trendline_found) == as_tuples(find_flags_pennants_trendline(log_close, 12))
+
+
+@pytest.mark.parametrize("name", ["log", "zscore", "heikin_ashi"])
+def test_chart_detectors_search_transformed_candles(name: str) -> None:
+    candles = CandleFeatures.from_frame(btc_candles(), *OHLC).transform(name)
+    # Log and z-score closes are searched as they are, Heikin-Ashi ones in logs
+    prices = np.log(candles.close) if name == "heikin_ashi" else np.array(candles.close)
+
+    assert not np.isnan(candles.prices).any()
+    assert as_tuples(find_hs_patterns(candles, 6)) == as_tuples(find_hs_patterns(prices, 6))
+    assert as_tuples(find_flags_pennants_pips(candles, 12)) == as_tuples(find_flags_pennants_pips(prices, 12))
@@ -0,0 +1,92 @@
+import numpy as np
+import pytest
+
+from app.neurotrader.TechnicalAnalysisAutomation.directional_change import (
+    DirectionalChange,
+    directional_change,
+    get_extremes,
+    get_extremes_multi,
+)
+from app.tests.test_neurotrader.test_chart_candles import btc_candles
+
+SIGMAS = [0.005, 0.01, 0.02, 0.04]
+
+
+def loop_directional_change(close: np.ndarray, high: np.ndarray, low: np.ndarray, sigma: float) -> tuple:
+    # The loop directional_change was before it became a state machine
+    up_zig = True
+    tmp_max, tmp_min = high[0], low[0]
+    tmp_max_i, tmp_min_i = 0, 0
+    tops, bottoms = [], []
+
+    for i in range(len(close)):
+        if up_zig:
+            if high[i] > tmp_max:
+                tmp_max, tmp_max_i = high[i], i
+            elif close[i] < tmp_max - tmp_max * sigma:
+                tops.append([i, tmp_max_i, tmp_max])
+                up_zig = False
+                tmp_min, tmp_min_i = low[i], i
+        elif low[i] < tmp_min:
+            tmp_min, tmp_min_i = low[i], i
+        elif close[i] > tmp_min + tmp_min * sigma:
+            bottoms.append([i, tmp_min_i, tmp_min])
+            up_zig = True
+            tmp_max, tmp_max_i = high[i], i
+
+    return tops, bottoms
+
+
+def test_update_emits_extremes_on_the_confirming_bar() -> None:
+    dc = DirectionalChange(0.1)
+    # (high, low, close): a top of 12 confirmed by the close of 10.5, then a
+    # bottom of 8 confirmed by the close of 9.2
+    bars = [(10, 9, 9.5), (12, 11, 11.5), (11.5, 10, 10.5), (10, 8, 8.5), (9.5, 8.5, 9.2), (9.6, 9, 9.4)]
+
+    events = [dc.update(*bar) for bar in bars]
+
+    assert events == [None, None, (1, [2, 1, 12]), None, (-1, [4, 3, 8]), None]
+    assert dc.tops == [[2, 1, 12]]
+    assert dc.bottoms == [[4, 3, 8]]
+
+
+@pytest.mark.parametrize("sigma", SIGMAS)
+def test_wrapper_matches_previous_loop(sigma: float) -> None:
+    candles_df = btc_candles()
+    close, high, low = (candles_df[column].to_numpy() for column in ("close", "high", "low"))
+
+    tops, bottoms = directional_change(close, high, low, sigma)
+
+    assert (tops, bottoms) == loop_directional_change(close, high, low, sigma)
+    assert len(tops) > 0 and len(bottoms) > 0
+
+
+@pytest.mark.parametrize("sigma", SIGMAS)
+def test_bars_fed_one_at_a_time_match_batch(sigma: float) -> None:
+    candles_df = btc_candles()
+    dc = DirectionalChange(sigma)
+
+    events = [dc.update(high, low, close)
+              for high, low, close in candles_df[["high", "low", "close"]].itertuples(index=False)]
+
+    tops, bottoms = directional_change(candles_df["close"], candles_df["high"], candles_df["low"], sigma)
+    confirmed = [event for event in events if event is not None]
+    assert [extreme for kind, extreme in confirmed if kind == 1] == tops
+    assert [extreme for kind, extreme in confirmed if kind == -1] == bottoms
+    # Each extreme is emitted on the bar confirming it
+    assert all(event[1][0] == i for i, event in enumerate(events) if event is not None)
+
+
+def test_extremes_of_several_sigmas_match_one_sigma_at_a_time() -> None:
+    candles_df = btc_candles()
+
+    extremes = get_extremes_multi(candles_df, SIGMAS)
+
+    assert list(extremes) == SIGMAS
+    for sigma in SIGMAS:
+        assert extremes[sigma].equals(get_extremes(candles_df, sigma))
+
+
+def test_sigmas_must_be_unique() -> None:
+    with pytest.raises(Exception):
+        get_extremes_multi(btc_candles(100), [0.01, 0.02, 0.01])
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from app.candlestick.patterns.candle_array import CandleArray
+from app.neurotrader.TechnicalAnalysisAutomation.rolling_window import (
+    rw_extremes,
+    rw_extremes_chunked,
+)
+from app.tests.test_neurotrader.test_chart_candles import btc_candles
+
+
+@pytest.mark.parametrize("order", [1, 3, 10])
+@pytest.mark.parametrize("chunk_size", [1, 7, 21, 500, 1999, 2000, 5000])
+def test_chunked_extremes_match_single_pass(order: int, chunk_size: int) -> None:
+    close = np.log(btc_candles(2000)["close"].to_numpy())
+
+    result = rw_extremes_chunked(close, order, chunk_size=chunk_size)
+
+    assert result == rw_extremes(close, order)
+    assert len(result[0]) > 0 and len(result[1]) > 0
+
+
+@pytest.mark.parametrize("order", [2, 10])
+def test_chunked_extremes_on_process_pool(order: int) -> None:
+    close = np.log(btc_candles(2000)["close"].to_numpy())
+
+    result = rw_extremes_chunked(close, order, chunk_size=300, processes=2)
+
+    assert result == rw_extremes(close, order)
+
+
+def test_chunked_extremes_of_candle_array() -> None:
+    candles = CandleArray.from_frame(btc_candles(1000), time_column="date")
+
+    assert rw_extremes_chunked(candles, 5, chunk_size=128) == rw_extremes(candles.close, 5)